@@ -1,36 +1,95 @@
-from flask import Flask, render_template, request, redirect, url_for
+from flask import Flask, render_template, request, redirect, url_for, jsonify, send_from_directory, make_response
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import logging
+import orjson
 import os
+import sys
 import csv
-from datetime import datetime, timedelta
+import mmap
+import gzip
+import hashlib
+import zlib
+import time
 import threading
-from collections import defaultdict
+from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, cold fetches there aren't coordinated across processes
+    fcntl = None
 
 app = Flask(__name__)
 
+# Diagnostics go through logging so messages below the configured level are never formatted
+logging.basicConfig(level=os.environ.get('LOGLEVEL', 'WARNING').upper())
+LOG = logging.getLogger(__name__)
+
 # Cache configuration
 PACKS_CACHE_FILE = 'arkham_packs_cache.json'
-CARDS_CACHE_FILE = 'arkham_cards_cache.json'
+CARDS_CACHE_FILE = 'arkham_cards_cache.json.gz'  # Gzipped, the cards JSON is large and very repetitive
+LEGACY_CARDS_CACHE_FILE = 'arkham_cards_cache.json'  # Uncompressed cards cache written by older versions
 TABOO_CACHE_FILE = 'arkham_taboo_cache.json'
 PACK_CARDS_CACHE_DIR = 'pack_cards_cache'
 CACHE_DURATION_HOURS = 168 # Cache for a week
+PACK_CARDS_FETCH_WORKERS = 8  # Uncached packs fetched concurrently, stays within the session's connection pool
+FETCH_LOCK_TIMEOUT_SECONDS = 10  # How long a cold fetch waits on another worker's fetch before doing its own
+FETCH_LOCK_POLL_SECONDS = 0.1
+CACHE_GZIP_LEVEL = 1  # Favor speed, level 1 already shrinks the JSON several times over
+RESPONSE_GZIP_LEVEL = 1  # Draft responses are compressed per request, so favor speed here too
+RESPONSE_GZIP_MIN_SIZE = 1024  # Smaller bodies aren't worth the gzip overhead
+# Behind a proxy or server that already compresses responses, set GZIP_RESPONSES=0 to leave it to them
+GZIP_RESPONSES = os.environ.get('GZIP_RESPONSES', '1') != '0'
+GZIP_ENDPOINTS = frozenset({'index', 'api_cards', 'draft', 'draft_now', 'get_draft_content'})  # The large HTML/JSON responses
 PACKS_API_URL = 'https://arkhamdb.com/api/public/packs/'
 CARDS_API_URL = 'https://arkhamdb.com/api/public/cards/'
 TABOO_API_URL = 'https://arkhamdb.com/api/public/taboos/'
 ARKHAMDB_BASE_URL = 'https://arkhamdb.com'
+CARD_EVALUATIONS_FILE = os.path.join('card_evaluation', 'card_evaluations', 'CardEvaluations.csv')
 
 # Thread locks to prevent duplicate concurrent cache refreshes
 _cache_refresh_locks = defaultdict(threading.Lock)
 
-# Faction to Magic color mapping
+# Parsed cache files kept in memory (path -> (mtime, data)), re-parsed only when the file's mtime changes
+_parsed_caches = {}
+_parsed_cache_locks = defaultdict(threading.Lock)
+
+# Structures derived from parsed caches (name -> (source data, derived value)), rebuilt
+# whenever the memoized loaders hand out a new data object
+_derived_caches = {}
+
+# Bounded memos (key -> (source data, value)) read and written through memo_get/memo_put. An
+# entry is only reused while the data objects it was built from are still the current ones,
+# the memoized caches hand out new objects on refresh
+
+# Converted Draftmancer cards per pack selection
+DRAFTMANCER_CARDS_MEMO_SIZE = 64
+_draftmancer_cards_memo = {}
+_draftmancer_cards_memo_lock = threading.Lock()
+# Per-pack card filtering at a pack quantity of 1, scaled by each draft's pack quantities
+PACK_CARD_SCAN_MEMO_SIZE = 512
+_pack_card_scan_memo = {}
+_pack_card_scan_memo_lock = threading.Lock()
+
+# Shared HTTP session so ArkhamDB fetches reuse pooled keep-alive connections. Transient
+# gateway errors are retried along with connection errors
+SESSION = requests.Session()
+SESSION.headers['User-Agent'] = 'arkham-versus-draft (+https://github.com/druerridge/arkham-versus-draft)'
+SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10,
+                                      max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))))
+
+# Faction to Magic color mapping (tuples, so cards can share them without copying)
 FACTION_COLOR_MAP = {
-    'guardian': ['U'], 
-    'seeker': ['W'],   
-    'rogue': ['G'],    
-    'mystic': ['B'],   
-    'survivor': ['R'], 
-    'neutral': [],     
+    'guardian': ('U',), 
+    'seeker': ('W',),   
+    'rogue': ('G',),    
+    'mystic': ('B',),   
+    'survivor': ('R',), 
+    'neutral': (),     
 }
 
 # Type code to Magic type mapping
@@ -46,7 +105,7 @@ def get_investigator_colors(card):
     """Get colors for an investigator based on deck_options instead of faction_code."""
     if card.get('type_code') != 'investigator':
         # For non-investigators, use the original faction_code logic
-        return FACTION_COLOR_MAP.get(card.get('faction_code', 'neutral'), [])
+        return FACTION_COLOR_MAP.get(card.get('faction_code') or 'neutral', ())
     
     # For investigators, extract factions from deck_options
     deck_options = card.get('deck_options', [])
@@ -61,7 +120,7 @@ def get_investigator_colors(card):
     # Convert factions to colors and sort for consistency
     colors = []
     for faction in sorted(unique_factions):
-        faction_colors = FACTION_COLOR_MAP.get(faction, [])
+        faction_colors = FACTION_COLOR_MAP.get(faction, ())
         colors.extend(faction_colors)
     
     # Remove duplicates while preserving order
@@ -72,6 +131,7 @@ def get_investigator_colors(card):
     
     return unique_colors
 
+@lru_cache(maxsize=8192)  # The same image paths come up for every draft
 def format_image_url(image_src):
     """Format image URL by prepending ArkhamDB base URL if needed."""
     if not image_src:
@@ -80,6 +140,11 @@ def format_image_url(image_src):
         return image_src  # Already a full URL
     return ARKHAMDB_BASE_URL + image_src
 
+def parse_pack_quantities(form, selected_sets):
+    """Get the quantity submitted for each selected pack, defaulting to 1 if not specified."""
+    form_get = form.get
+    return {pack_name: int(form_get(f'quantity_{pack_name}', 1)) for pack_name in selected_sets}
+
 def parse_excluded_cards(excluded_text):
     """Parse the excluded cards text and return a set of normalized card names."""
     if not excluded_text:
@@ -113,7 +178,31 @@ def parse_excluded_cards(excluded_text):
     
     return excluded_cards
 
-def parse_cards_to_include(include_text):
+def get_card_name_index(arkham_cards):
+    """Get the card to use for each lowercased card name, built once per cards data."""
+    def build_card_name_index(cards):
+        card_name_to_data = {}
+        for card in cards:
+            card_name = card.get('name', '').lower()
+            if card_name:
+                # Prioritize main cards over bonded cards
+                # If we already have this card name, only replace if the new one is NOT a bonded card
+                # or if we don't have a main card yet
+                existing = card_name_to_data.get(card_name)
+                if existing is None:
+                    # First card with this name
+                    card_name_to_data[card_name] = card
+                elif existing.get('bonded_to') and not card.get('bonded_to'):
+                    # Replace bonded card with main card
+                    card_name_to_data[card_name] = card
+                elif not existing.get('bonded_to') and not card.get('bonded_to'):
+                    # Both are main cards, prefer the one with deck requirements (for investigators)
+                    if card.get('type_code') == 'investigator' and card.get('deck_requirements', {}).get('card'):
+                        card_name_to_data[card_name] = card
+        return card_name_to_data
+    return get_derived('card_name_index', arkham_cards, build_card_name_index)
+
+def parse_cards_to_include(include_text, arkham_cards=None):
     """Parse the cards to include text and return a dict with card names, quantities, and types."""
     if not include_text:
         return {}
@@ -122,27 +211,10 @@ def parse_cards_to_include(include_text):
     try:
         lines = include_text.strip().split('\n')
         
-        # Get card database for type lookup
-        arkham_cards = get_arkham_cards()
-        card_name_to_data = {}
-        if arkham_cards:
-            for card in arkham_cards:
-                card_name = card.get('name', '').lower()
-                if card_name:
-                    # Prioritize main cards over bonded cards
-                    # If we already have this card name, only replace if the new one is NOT a bonded card
-                    # or if we don't have a main card yet
-                    existing = card_name_to_data.get(card_name)
-                    if existing is None:
-                        # First card with this name
-                        card_name_to_data[card_name] = card
-                    elif existing.get('bonded_to') and not card.get('bonded_to'):
-                        # Replace bonded card with main card
-                        card_name_to_data[card_name] = card
-                    elif not existing.get('bonded_to') and not card.get('bonded_to'):
-                        # Both are main cards, prefer the one with deck requirements (for investigators)
-                        if card.get('type_code') == 'investigator' and card.get('deck_requirements', {}).get('card'):
-                            card_name_to_data[card_name] = card
+        # Get card database for type lookup (unless the caller already loaded it)
+        if arkham_cards is None:
+            arkham_cards = get_arkham_cards()
+        card_name_to_data = get_card_name_index(arkham_cards) if arkham_cards else {}
         
         for line in lines:
             line = line.strip()
@@ -151,38 +223,54 @@ def parse_cards_to_include(include_text):
             
             # Parse format like "1 Knife" or "2 Emergency Cache"
             parts = line.split(' ', 1)
-            if len(parts) >= 2:
-                try:
-                    quantity = int(parts[0])
-                    card_name = parts[1].strip()
-                    if card_name:
-                        # Look up card type
-                        card_data = card_name_to_data.get(card_name.lower())
-                        card_type = 'player'  # default
-                        
-                        if card_data:
-                            if card_data.get('type_code') == 'investigator':
-                                card_type = 'investigator'
-                            elif card_data.get('subtype_code') == 'basicweakness':
-                                card_type = 'basicweakness'
-                            else:
-                                card_type = 'player'
-                        
-                        cards_to_include[card_name.lower()] = {
-                            'name': card_name,
-                            'quantity': quantity,
-                            'type': card_type,
-                            'data': card_data
-                        }
-                except ValueError:
-                    # If first part isn't a number, skip this line
-                    continue
+            if len(parts) < 2:
+                continue
+            try:
+                quantity = int(parts[0])
+            except ValueError:
+                # If first part isn't a number, skip this line
+                continue
+            card_name = parts[1].strip()
+            if not card_name:
+                continue
+            card_name_lower = card_name.lower()
+            
+            # Look up card type
+            card_data = card_name_to_data.get(card_name_lower)
+            card_type = 'player'  # default
+            
+            if card_data:
+                if card_data.get('type_code') == 'investigator':
+                    card_type = 'investigator'
+                elif card_data.get('subtype_code') == 'basicweakness':
+                    card_type = 'basicweakness'
+                else:
+                    card_type = 'player'
+            
+            cards_to_include[card_name_lower] = {
+                'name': card_name,
+                'quantity': quantity,
+                'type': card_type,
+                'data': card_data
+            }
     except Exception as e:
-        print(f"Error in parse_cards_to_include: {e}")
+        LOG.error("Error in parse_cards_to_include: %s", e)
         return {}
     
     return cards_to_include
 
+def index_player_card_entries(player_cards):
+    """Map (card name, upper-case pack code) to the position of the first "<quantity> <name> (AH<PACK>) <number>"
+    entry for it, skipping entries whose quantity can't be merged into."""
+    index = {}
+    for position, entry in enumerate(player_cards):
+        quantity, _, rest = entry.partition(' ')
+        card_name, separator, pack_part = rest.rpartition(' (AH')
+        if not separator or not quantity.isdigit():
+            continue
+        index.setdefault((card_name, pack_part.split(')', 1)[0]), position)
+    return index
+
 def add_cards_to_include_to_lists(cards_to_include, investigators_cards, basic_weaknesses_cards, player_cards, arkham_cards, existing_custom_cards=None):
     """Add cards to include to the appropriate card lists and update custom cards."""
     if not cards_to_include:
@@ -190,6 +278,12 @@ def add_cards_to_include_to_lists(cards_to_include, investigators_cards, basic_w
     
     custom_cards = []
     
+    # Cards by code for related/bonded card lookups
+    code_to_card, _, _ = get_card_indexes(arkham_cards)
+    
+    # Player card entries by (card name, pack code), built when the first player card is added
+    player_card_index = None
+    
     # Track cards that have already been added to prevent duplicates
     # Include existing custom cards from pack selection
     added_card_names = set()
@@ -204,12 +298,12 @@ def add_cards_to_include_to_lists(cards_to_include, investigators_cards, basic_w
         card_data = card_info['data']
         
         # Skip if this card has already been added
-        if card_name.lower() in added_card_names:
-            print(f"Skipping duplicate card: {card_name}")
+        if card_name_lower in added_card_names:
+            LOG.info("Skipping duplicate card: %s", card_name)
             continue
             
         # Mark this card as added
-        added_card_names.add(card_name.lower())
+        added_card_names.add(card_name_lower)
         
         # Create a custom card entry if we have the card data
         if card_data:
@@ -254,18 +348,19 @@ def add_cards_to_include_to_lists(cards_to_include, investigators_cards, basic_w
                         related_card_codes = list(card_req_data.keys())
                         # Find the names of these cards
                         for code in related_card_codes:
-                            related_card = next((c for c in arkham_cards if c.get('code') == code), None)
+                            related_card = code_to_card.get(code)
                             if related_card:
                                 related_card_name = related_card.get('name', '')
+                                related_card_name_lower = related_card_name.lower()
                                 # Only add if not already added
-                                if related_card_name.lower() not in added_card_names:
+                                if related_card_name_lower not in added_card_names:
                                     related_cards.append(related_card_name)
                                     # Add to draft effects so they're added to drafter's pool
                                     draft_effect_cards.append(related_card_name)
                                     # Add to list of cards that need custom entries
                                     related_cards_to_add.append(related_card)
                                     # Mark as added
-                                    added_card_names.add(related_card_name.lower())
+                                    added_card_names.add(related_card_name_lower)
             
             # Add bonded cards to related_cards (for any card type that has them)
             bonded_cards = card_data.get('bonded_cards', [])
@@ -273,18 +368,19 @@ def add_cards_to_include_to_lists(cards_to_include, investigators_cards, basic_w
                 for bonded_card_info in bonded_cards:
                     bonded_code = bonded_card_info.get('code')
                     if bonded_code:
-                        bonded_card = next((c for c in arkham_cards if c.get('code') == bonded_code), None)
+                        bonded_card = code_to_card.get(bonded_code)
                         if bonded_card:
                             bonded_name = bonded_card.get('name', '')
+                            bonded_name_lower = bonded_name.lower()
                             # Only add if not already added
-                            if bonded_name.lower() not in added_card_names:
+                            if bonded_name_lower not in added_card_names:
                                 related_cards.append(bonded_name)
                                 # Add to draft effects so they're added to drafter's pool
                                 draft_effect_cards.append(bonded_name)
                                 # Add to list of cards that need custom entries
                                 related_cards_to_add.append(bonded_card)
                                 # Mark as added
-                                added_card_names.add(bonded_name.lower())
+                                added_card_names.add(bonded_name_lower)
             
             # Add related_cards if we have any
             if related_cards:
@@ -395,40 +491,213 @@ def add_cards_to_include_to_lists(cards_to_include, investigators_cards, basic_w
             collector_number = card_data.get('code', '001') if card_data else '001'
             entry = f"{quantity} {card_name} (AH{pack_code}) {collector_number}"
             # Check if card already exists and merge quantities
-            existing_index = None
-            for i, existing_entry in enumerate(player_cards):
-                if card_name in existing_entry and f"(AH{pack_code})" in existing_entry:
-                    existing_index = i
-                    break
+            if player_card_index is None:
+                player_card_index = index_player_card_entries(player_cards)
+            existing_index = player_card_index.get((card_name, pack_code))
             
             if existing_index is not None:
                 # Merge quantities
-                existing_parts = player_cards[existing_index].split(' ', 1)
-                try:
-                    existing_quantity = int(existing_parts[0])
-                    new_quantity = existing_quantity + quantity
-                    player_cards[existing_index] = f"{new_quantity} {existing_parts[1]}"
-                except (ValueError, IndexError):
-                    # If parsing fails, just add as new entry
-                    player_cards.append(entry)
+                existing_quantity, existing_rest = player_cards[existing_index].split(' ', 1)
+                player_cards[existing_index] = f"{int(existing_quantity) + quantity} {existing_rest}"
             else:
+                player_card_index[(card_name, pack_code)] = len(player_cards)
                 player_cards.append(entry)
     
     return investigators_cards, basic_weaknesses_cards, player_cards, custom_cards
 
-def is_cache_valid(cache_file):
-    """Check if the cache file exists and is still valid."""
+def is_cache_fresh(mtime):
+    """Check if a cache file last modified at mtime (epoch seconds) is still valid."""
+    # Check if cache is older than CACHE_DURATION_HOURS (plain epoch arithmetic, no datetime objects)
+    return time.time() - mtime < CACHE_DURATION_HOURS * 3600
+
+def load_cache_file(cache_file, memoize=False, prepare=None):
+    """Parse a JSON (or gzipped JSON, for .gz paths) cache file and report whether it is
+    still valid, using a single open + fstat.
+    
+    Returns (data, is_fresh). With memoize=True the parsed copy is kept in memory and
+    reused while the file's mtime is unchanged. prepare, if given, is run once on each
+    freshly parsed copy. Raises ValueError if the file can't be decompressed or parsed.
+    """
+    with _parsed_cache_locks[cache_file]:
+        with open(cache_file, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            cached = _parsed_caches.get(cache_file) if memoize else None
+            if cached and cached[0] == stat.st_mtime_ns:
+                data = cached[1]
+            else:
+                # Map the file rather than reading it through a Python-side buffer
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    if cache_file.endswith('.gz'):
+                        try:
+                            raw_json = gzip.decompress(view)
+                        except (OSError, EOFError, zlib.error) as e:
+                            # Report a corrupt or truncated cache like unparseable JSON so it gets refetched
+                            raise ValueError(f"Invalid gzip data in {cache_file}: {e}") from e
+                        data = orjson.loads(raw_json)
+                    else:
+                        data = orjson.loads(view)
+                if prepare:
+                    prepare(data)
+                if memoize:
+                    _parsed_caches[cache_file] = (stat.st_mtime_ns, data)
+    
+    return data, is_cache_fresh(stat.st_mtime)
+
+def invalidate_memoized_cache(cache_file):
+    """Drop the in-memory copy of a cache file so the next load re-parses it."""
+    _parsed_caches.pop(cache_file, None)
+
+def temp_cache_path(cache_file):
+    """Get a temp path next to a cache file that is unique to this process and thread."""
+    return f"{cache_file}.tmp.{os.getpid()}.{threading.get_ident()}"
+
+def ensure_cache_dir(cache_file):
+    """Create the directory a cache file lives in, if it has one."""
+    cache_dir = os.path.dirname(cache_file)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+def write_cache_bytes(cache_file, raw_json, validators=None):
+    """Write serialized JSON to a cache file atomically so readers never see a partially
+    written file, gzipping it for .gz paths.
+    
+    validators are the HTTP validators the data was served with, saved alongside the cache
+    so that its next refresh can be a conditional request.
+    """
+    if cache_file.endswith('.gz'):
+        raw_json = gzip.compress(raw_json, compresslevel=CACHE_GZIP_LEVEL)
+    ensure_cache_dir(cache_file)
+    tmp_path = temp_cache_path(cache_file)
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(raw_json)
+            f.flush()
+            os.fsync(f.fileno())
+        # os.replace is atomic within a filesystem, readers get either the old or the new file
+        os.replace(tmp_path, cache_file)
+    finally:
+        # Only left behind if the write failed
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+    invalidate_memoized_cache(cache_file)
+    save_cache_validators(cache_file, validators)
+
+def cache_validators_path(cache_file):
+    """Get the path of the file holding the HTTP validators of a cache file."""
+    return cache_file + '.meta.json'
+
+def save_cache_validators(cache_file, validators):
+    """Save (or, with none, remove) the HTTP validators of a freshly written cache file."""
+    if validators:
+        meta_path = cache_validators_path(cache_file)
+        tmp_path = temp_cache_path(meta_path)
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(validators))
+        os.replace(tmp_path, meta_path)
+    else:
+        try:
+            os.remove(cache_validators_path(cache_file))
+        except FileNotFoundError:
+            pass
+
+def read_cache_validators(cache_file):
+    """Get the HTTP validators saved with a cache file, empty if it was saved without any."""
+    try:
+        with open(cache_validators_path(cache_file), 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def load_cache_validators(cache_file):
+    """Get the conditional request headers for refreshing a cache file, empty if there is
+    no cache file or it was saved without validators."""
     if not os.path.exists(cache_file):
-        return False
-    
-    # Check if cache is older than CACHE_DURATION_HOURS
-    cache_time = datetime.fromtimestamp(os.path.getmtime(cache_file))
-    expiry_time = cache_time + timedelta(hours=CACHE_DURATION_HOURS)
-    return datetime.now() < expiry_time
+        return {}
+    validators = read_cache_validators(cache_file)
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+def renew_cache_file(cache_file):
+    """Mark a cache file the server reported unchanged as fresh again, keeping any
+    in-memory parsed copy of it instead of re-parsing the same data."""
+    with _parsed_cache_locks[cache_file]:
+        mtime_before = os.stat(cache_file).st_mtime_ns
+        os.utime(cache_file, None)
+        cached = _parsed_caches.get(cache_file)
+        if cached and cached[0] == mtime_before:
+            _parsed_caches[cache_file] = (os.stat(cache_file).st_mtime_ns, cached[1])
 
-def cache_exists(cache_file):
-    """Check if cache file exists, regardless of validity."""
-    return os.path.exists(cache_file)
+def download_json(url, timeout, cache_file=None):
+    """Download a JSON payload, returning (raw_bytes, parsed_data, validators).
+    
+    The raw bytes can go straight into a cache file without re-serializing the parsed data.
+    With cache_file, the request is conditional on the validators saved with that cache and
+    (None, None, None) is returned if the server reports the data unchanged.
+    """
+    headers = load_cache_validators(cache_file) if cache_file else None
+    response = SESSION.get(url, timeout=timeout, headers=headers)
+    if response.status_code == 304 and headers:
+        return None, None, None
+    response.raise_for_status()
+    raw_json = response.content
+    validators = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+    return raw_json, orjson.loads(raw_json), {key: value for key, value in validators.items() if value}
+
+def download_cache_json(url, timeout, cache_file, load_func):
+    """Download the JSON payload for a cache file, conditional on the validators saved with it.
+    
+    Returns (raw_bytes, parsed_data, validators) like download_json. If the server reports the
+    data unchanged, the cache is renewed and (None, cached_data, None) is returned instead. A
+    cache that can't be loaded (corrupt or truncated) is refetched without its validators, since
+    "unchanged" would otherwise keep serving nothing until the upstream data changes.
+    """
+    raw_json, data, validators = download_json(url, timeout, cache_file=cache_file)
+    if raw_json is not None:
+        return raw_json, data, validators
+    data, _ = load_func()
+    if data is not None:
+        renew_cache_file(cache_file)
+        return None, data, None
+    LOG.warning("%s is unchanged upstream but can't be loaded, refetching it", cache_file)
+    save_cache_validators(cache_file, None)
+    return download_json(url, timeout)
+
+def fetch_missing_cache(cache_file, fetch_func, load_func):
+    """Fetch a missing cache while holding a lock file, so concurrent workers wait for a
+    single API fetch and then read the cache it wrote instead of all fetching at once.
+    
+    A worker that can't get the lock within FETCH_LOCK_TIMEOUT_SECONDS fetches without it,
+    so a hung upstream fetch doesn't stall every request queued behind it.
+    """
+    if fcntl is None:
+        return fetch_func()
+    
+    ensure_cache_dir(cache_file)
+    with open(cache_file + '.lock', 'w') as lock_file:
+        deadline = time.monotonic() + FETCH_LOCK_TIMEOUT_SECONDS
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    LOG.warning("Timed out waiting for another fetch of %s, fetching without the lock", cache_file)
+                    return fetch_func()
+                time.sleep(FETCH_LOCK_POLL_SECONDS)
+        try:
+            # Another worker may have written the cache while we waited for the lock
+            data, _ = load_func()
+            if data:
+                return data
+            return fetch_func()
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
 def refresh_cache_in_background(refresh_func, cache_key, *args):
     """Refresh cache in background thread, preventing duplicate concurrent refreshes."""
@@ -438,267 +707,301 @@ def refresh_cache_in_background(refresh_func, cache_key, *args):
         # Try to acquire the lock without blocking
         if cache_lock.acquire(blocking=False):
             try:
-                print(f"Starting background refresh for {cache_key}")
+                LOG.info("Starting background refresh for %s", cache_key)
                 refresh_func(*args)
-                print(f"Completed background refresh for {cache_key}")
+                LOG.info("Completed background refresh for %s", cache_key)
             except Exception as e:
-                print(f"Background cache refresh failed for {cache_key}: {e}")
+                LOG.error("Background cache refresh failed for %s: %s", cache_key, e)
             finally:
                 cache_lock.release()
         else:
-            print(f"Background refresh already in progress for {cache_key}, skipping")
+            LOG.info("Background refresh already in progress for %s, skipping", cache_key)
     
     thread = threading.Thread(target=background_refresh, daemon=True)
     thread.start()
 
+def get_cached_or_fetch(description, cache_file, cache_key, load_func, fetch_func):
+    """Get data from its cache, refreshing a stale cache in the background and fetching a
+    missing one from the API synchronously."""
+    # A single open + fstat both loads the cache and tells us if it is still valid
+    data, cache_is_fresh = load_func()
+    if data:
+        if cache_is_fresh:
+            LOG.info("Using cached %s", description)
+        else:
+            # Cache exists but is stale, start background refresh
+            LOG.info("Using stale cached %s, refreshing in background", description)
+            refresh_cache_in_background(fetch_func, cache_key)
+        return data
+    
+    # No cache exists, fetch from API synchronously
+    data = fetch_missing_cache(cache_file, fetch_func, load_func)
+    if data:
+        return data
+    
+    LOG.warning("Unable to load %s", description)
+    return []
+
 def fetch_and_cache_taboos():
     """Fetch taboo lists from API and cache them locally."""
     try:
-        print(f"Fetching taboo lists from {TABOO_API_URL}")
-        response = requests.get(TABOO_API_URL, timeout=10)
-        response.raise_for_status()
-        
-        taboo_data = response.json()
+        LOG.info("Fetching taboo lists from %s", TABOO_API_URL)
+        raw_json, taboo_data, validators = download_cache_json(TABOO_API_URL, 10, TABOO_CACHE_FILE, load_cached_taboos)
+        if raw_json is None:
+            # Unchanged since it was cached, keep using the cache
+            LOG.info("Taboo lists unchanged, renewed cache")
+            return taboo_data
         
         # Cache the data
-        with open(TABOO_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(taboo_data, f, indent=2, ensure_ascii=False)
+        write_cache_bytes(TABOO_CACHE_FILE, raw_json, validators)
         
-        print(f"Cached {len(taboo_data)} taboo lists")
+        LOG.info("Cached %s taboo lists", len(taboo_data))
         return taboo_data
         
     except requests.RequestException as e:
-        print(f"Error fetching taboo lists from API: {e}")
+        LOG.error("Error fetching taboo lists from API: %s", e)
         return None
     except json.JSONDecodeError as e:
-        print(f"Error parsing taboo list JSON: {e}")
+        LOG.error("Error parsing taboo list JSON: %s", e)
         return None
 
 def load_cached_taboos():
-    """Load taboo lists from cache file."""
+    """Load taboo lists from cache file, reusing the parsed copy while the file is unchanged.
+    
+    Returns (data, is_fresh).
+    """
     try:
-        if os.path.exists(TABOO_CACHE_FILE):
-            with open(TABOO_CACHE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        return load_cache_file(TABOO_CACHE_FILE, memoize=True)
+    except FileNotFoundError:
+        pass
     except Exception as e:
-        print(f"Error loading cached taboo lists: {e}")
-    return None
+        LOG.error("Error loading cached taboo lists: %s", e)
+    return None, False
 
 def get_arkham_taboos():
     """Get Arkham Horror taboo lists, either from cache or API."""
-    # Check if we have a valid cache
-    if is_cache_valid(TABOO_CACHE_FILE):
-        print("Using cached taboo data")
-        taboo_data = load_cached_taboos()
-        if taboo_data:
-            return taboo_data
-    
-    # Check if cache exists but is stale
-    if cache_exists(TABOO_CACHE_FILE):
-        print("Using stale taboo cache, refreshing in background")
-        taboo_data = load_cached_taboos()
-        if taboo_data:
-            # Start background refresh
-            refresh_cache_in_background(fetch_and_cache_taboos, "taboo_cache")
-            return taboo_data
-    
-    # No cache exists, fetch from API synchronously
-    taboo_data = fetch_and_cache_taboos()
-    if taboo_data:
-        return taboo_data
-    
-    print("Unable to load taboo data")
-    return []
+    return get_cached_or_fetch("taboo data", TABOO_CACHE_FILE, "taboo_cache", load_cached_taboos, fetch_and_cache_taboos)
 
 def fetch_and_cache_packs():
     """Fetch packs from API and cache them locally."""
     try:
-        print(f"Fetching packs from {PACKS_API_URL}")
-        response = requests.get(PACKS_API_URL, timeout=10)
-        response.raise_for_status()
-        
-        packs_data = response.json()
+        LOG.info("Fetching packs from %s", PACKS_API_URL)
+        raw_json, packs_data, validators = download_cache_json(PACKS_API_URL, 10, PACKS_CACHE_FILE, load_cached_packs)
+        if raw_json is None:
+            # Unchanged since it was cached, keep using the cache
+            LOG.info("Packs unchanged, renewed cache")
+            return packs_data
         
         # Cache the data
-        with open(PACKS_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(packs_data, f, indent=2, ensure_ascii=False)
+        write_cache_bytes(PACKS_CACHE_FILE, raw_json, validators)
         
-        print(f"Successfully cached {len(packs_data)} packs")
+        LOG.info("Successfully cached %s packs", len(packs_data))
         return packs_data
     
     except requests.RequestException as e:
-        print(f"Error fetching packs from API: {e}")
+        LOG.error("Error fetching packs from API: %s", e)
         return None
     except json.JSONDecodeError as e:
-        print(f"Error decoding JSON response: {e}")
+        LOG.error("Error decoding JSON response: %s", e)
         return None
 
 def load_cached_packs():
-    """Load packs from cache file."""
+    """Load packs from cache file, reusing the parsed copy while the file is unchanged.
+    
+    Returns (data, is_fresh).
+    """
     try:
-        with open(PACKS_CACHE_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error loading cache: {e}")
-        return None
+        return load_cache_file(PACKS_CACHE_FILE, memoize=True)
+    except FileNotFoundError:
+        return None, False
+    except ValueError as e:
+        LOG.error("Error loading cache: %s", e)
+        return None, False
 
 def get_packs():
     """Get Arkham Horror packs, either from cache or API."""
-    # Check if we have a valid cache
-    if is_cache_valid(PACKS_CACHE_FILE):
-        print("Using cached packs data")
-        packs_data = load_cached_packs()
-        if packs_data:
-            return packs_data
-    
-    # Check if cache exists but is stale
-    if cache_exists(PACKS_CACHE_FILE):
-        print("Using stale packs cache, refreshing in background")
-        packs_data = load_cached_packs()
-        if packs_data:
-            # Start background refresh
-            refresh_cache_in_background(fetch_and_cache_packs, "packs_cache")
-            return packs_data
-    
-    # No cache exists, fetch from API synchronously
-    packs_data = fetch_and_cache_packs()
-    if packs_data:
-        return packs_data
-    
-    print("Unable to load packs data")
-    return []
+    return get_cached_or_fetch("packs data", PACKS_CACHE_FILE, "packs_cache", load_cached_packs, fetch_and_cache_packs)
 
 def fetch_and_cache_cards():
     """Fetch cards from API and cache them locally."""
     try:
-        print(f"Fetching cards from {CARDS_API_URL}")
-        response = requests.get(CARDS_API_URL, timeout=30)  # Longer timeout for cards
-        response.raise_for_status()
-        
-        cards_data = response.json()
+        LOG.info("Fetching cards from %s", CARDS_API_URL)
+        raw_json, cards_data, validators = download_cache_json(CARDS_API_URL, 30, CARDS_CACHE_FILE, load_cached_cards)  # Longer timeout for cards
+        if raw_json is None:
+            # Unchanged since it was cached, keep using the cache
+            LOG.info("Cards unchanged, renewed cache")
+            return cards_data
+        intern_card_fields(cards_data)
         
-        # Cache the data
-        with open(CARDS_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cards_data, f, indent=2, ensure_ascii=False)
+        # Cache the data, the compressed cache supersedes any uncompressed one
+        write_cache_bytes(CARDS_CACHE_FILE, raw_json, validators)
+        try:
+            os.remove(LEGACY_CARDS_CACHE_FILE)
+        except FileNotFoundError:
+            pass
+        else:
+            invalidate_memoized_cache(LEGACY_CARDS_CACHE_FILE)
         
-        print(f"Successfully cached {len(cards_data)} cards")
+        LOG.info("Successfully cached %s cards", len(cards_data))
         return cards_data
     
     except requests.RequestException as e:
-        print(f"Error fetching cards from API: {e}")
+        LOG.error("Error fetching cards from API: %s", e)
         return None
     except json.JSONDecodeError as e:
-        print(f"Error decoding JSON response: {e}")
+        LOG.error("Error decoding JSON response: %s", e)
         return None
 
+# Card fields used as dict keys and in set lookups over and over
+INTERNED_CARD_FIELDS = ('code', 'pack_code', 'type_code', 'subtype_code', 'faction_code')
+
+def intern_card_fields(cards_data):
+    """Intern the short, repeated string fields of parsed cards so their hashing and comparisons are cheap."""
+    for card in cards_data:
+        for field in INTERNED_CARD_FIELDS:
+            value = card.get(field)
+            if type(value) is str:
+                card[field] = sys.intern(value)
+
 def load_cached_cards():
-    """Load cards from cache file."""
+    """Load cards from cache file, reusing the parsed copy while the file is unchanged.
+    
+    Returns (data, is_fresh).
+    """
     try:
-        with open(CARDS_CACHE_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error loading cards cache: {e}")
-        return None
+        try:
+            return load_cache_file(CARDS_CACHE_FILE, memoize=True, prepare=intern_card_fields)
+        except FileNotFoundError:
+            # Fall back to an uncompressed cache left by an older version until it is refreshed
+            return load_cache_file(LEGACY_CARDS_CACHE_FILE, memoize=True, prepare=intern_card_fields)
+    except FileNotFoundError:
+        return None, False
+    except ValueError as e:
+        LOG.error("Error loading cards cache: %s", e)
+        return None, False
 
 def get_pack_cards_cache_path(pack_code):
     """Get the cache file path for a specific pack."""
-    if not os.path.exists(PACK_CARDS_CACHE_DIR):
-        os.makedirs(PACK_CARDS_CACHE_DIR)
+    # The directory is only created when a pack is actually fetched, not on every lookup
     return os.path.join(PACK_CARDS_CACHE_DIR, f'{pack_code}_cards.json')
 
 def fetch_and_cache_pack_cards(pack_code):
     """Fetch cards from a specific pack and cache them."""
     try:
         pack_cards_url = f'{CARDS_API_URL}{pack_code}'
-        print(f"Fetching cards from pack {pack_code}: {pack_cards_url}")
-        response = requests.get(pack_cards_url, timeout=30)
-        response.raise_for_status()
-        
-        pack_cards_data = response.json()
+        LOG.info("Fetching cards from pack %s: %s", pack_code, pack_cards_url)
+        cache_path = get_pack_cards_cache_path(pack_code)
+        raw_json, pack_cards_data, validators = download_cache_json(
+            pack_cards_url, 30, cache_path, lambda: load_cached_pack_cards(pack_code))
+        if raw_json is None:
+            # Unchanged since it was cached, keep using the cache
+            LOG.info("Cards from pack %s unchanged, renewed cache", pack_code)
+            return pack_cards_data
         
         # Cache the data
-        cache_path = get_pack_cards_cache_path(pack_code)
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(pack_cards_data, f, indent=2, ensure_ascii=False)
+        write_cache_bytes(cache_path, raw_json, validators)
         
-        print(f"Successfully cached {len(pack_cards_data)} cards from pack {pack_code}")
+        LOG.info("Successfully cached %s cards from pack %s", len(pack_cards_data), pack_code)
         return pack_cards_data
     
     except requests.RequestException as e:
-        print(f"Error fetching pack {pack_code} cards from API: {e}")
+        LOG.error("Error fetching pack %s cards from API: %s", pack_code, e)
         return None
     except json.JSONDecodeError as e:
-        print(f"Error decoding JSON response for pack {pack_code}: {e}")
+        LOG.error("Error decoding JSON response for pack %s: %s", pack_code, e)
         return None
 
 def load_cached_pack_cards(pack_code):
-    """Load cached cards for a specific pack."""
+    """Load cached cards for a specific pack, reusing the parsed copy while the file is unchanged.
+    
+    Returns (data, is_fresh).
+    """
     cache_path = get_pack_cards_cache_path(pack_code)
     try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error loading pack {pack_code} cache: {e}")
-        return None
+        return load_cache_file(cache_path, memoize=True)
+    except FileNotFoundError:
+        return None, False
+    except ValueError as e:
+        LOG.error("Error loading pack %s cache: %s", pack_code, e)
+        return None, False
 
 def get_pack_cards(pack_code):
     """Get cards for a specific pack, either from cache or API."""
-    cache_path = get_pack_cards_cache_path(pack_code)
-    
-    # Check if we have a valid cache for this pack
-    if is_cache_valid(cache_path):
-        print(f"Using cached data for pack {pack_code}")
-        pack_cards_data = load_cached_pack_cards(pack_code)
-        if pack_cards_data:
-            return pack_cards_data
-    
-    # Check if cache exists but is stale
-    if cache_exists(cache_path):
-        print(f"Using stale cache for pack {pack_code}, refreshing in background")
-        pack_cards_data = load_cached_pack_cards(pack_code)
-        if pack_cards_data:
-            # Start background refresh
-            refresh_cache_in_background(fetch_and_cache_pack_cards, f"pack_cards_{pack_code}", pack_code)
-            return pack_cards_data
-    
-    # No cache exists, fetch from API synchronously
-    pack_cards_data = fetch_and_cache_pack_cards(pack_code)
-    if pack_cards_data:
-        return pack_cards_data
-    
-    print(f"Unable to load cards data for pack {pack_code}")
-    return []
+    return get_cached_or_fetch(f"cards data for pack {pack_code}", get_pack_cards_cache_path(pack_code), f"pack_cards_{pack_code}",
+                               lambda: load_cached_pack_cards(pack_code), lambda: fetch_and_cache_pack_cards(pack_code))
+
+def prefetch_pack_cards(pack_codes):
+    """Fetch the cards of all uncached packs concurrently rather than one round-trip at a time."""
+    uncached_pack_codes = [pack_code for pack_code in pack_codes
+                           if not os.path.exists(get_pack_cards_cache_path(pack_code))]
+    if len(uncached_pack_codes) < 2:
+        return
+    
+    with ThreadPoolExecutor(max_workers=min(PACK_CARDS_FETCH_WORKERS, len(uncached_pack_codes))) as executor:
+        list(executor.map(fetch_and_cache_pack_cards, uncached_pack_codes))
 
 def get_arkham_cards():
     """Get Arkham Horror cards, either from cache or API."""
-    # Check if we have a valid cache
-    if is_cache_valid(CARDS_CACHE_FILE):
-        print("Using cached cards data")
-        cards_data = load_cached_cards()
-        if cards_data:
-            return cards_data
-    
-    # Check if cache exists but is stale
-    if cache_exists(CARDS_CACHE_FILE):
-        print("Using stale cards cache, refreshing in background")
-        cards_data = load_cached_cards()
-        if cards_data:
-            # Start background refresh
-            refresh_cache_in_background(fetch_and_cache_cards, "cards_cache")
-            return cards_data
-    
-    # No cache exists, fetch from API synchronously
-    cards_data = fetch_and_cache_cards()
-    if cards_data:
-        return cards_data
-    
-    print("Unable to load cards data")
-    return []
+    return get_cached_or_fetch("cards data", CARDS_CACHE_FILE, "cards_cache", load_cached_cards, fetch_and_cache_cards)
+
+def get_derived(name, source, build):
+    """Return build(source), reusing the previous result while source is the same object
+    (or, for a tuple of sources, while each of them is the same object)."""
+    cached = _derived_caches.get(name)
+    if cached and (cached[0] is source or (
+            type(source) is tuple and type(cached[0]) is tuple and len(source) == len(cached[0])
+            and all(a is b for a, b in zip(cached[0], source)))):
+        return cached[1]
+    value = build(source)
+    _derived_caches[name] = (source, value)
+    return value
+
+def memo_get(memo, lock, key, sources):
+    """Get the value memoized under key, or None unless it was built from these same source objects."""
+    with lock:
+        cached = memo.get(key)
+    if cached and len(cached[0]) == len(sources) and all(a is b for a, b in zip(cached[0], sources)):
+        return cached[1]
+    return None
+
+def memo_put(memo, lock, key, sources, value, size):
+    """Memoize value under key along with the source objects it was built from, keeping at most size entries."""
+    with lock:
+        if key not in memo and len(memo) >= size:
+            # Drop the oldest entry
+            memo.pop(next(iter(memo)))
+        memo[key] = (sources, value)
+
+def get_player_card_codes(arkham_cards=None):
+    """Get the set of codes in the main cards cache, used to tell player cards apart."""
+    if arkham_cards is None:
+        arkham_cards = get_arkham_cards()
+    return get_derived('player_card_codes', arkham_cards,
+                       lambda cards: set(card.get('code') for card in cards if card.get('code')))
+
+def get_card_indexes(arkham_cards):
+    """Get (code_to_card, pack_to_positions, code_to_positions) indexes for the given cards data,
+    built once per cards data. The positions are indexes into arkham_cards, in card order."""
+    def build_card_indexes(cards):
+        code_to_card = {}
+        pack_to_positions = {}
+        code_to_positions = {}
+        for position, card in enumerate(cards):
+            code_to_card.setdefault(card.get('code'), card)
+            pack_to_positions.setdefault(card.get('pack_code'), []).append(position)
+            code_to_positions.setdefault(card.get('code', ''), []).append(position)
+        return code_to_card, pack_to_positions, code_to_positions
+    return get_derived('card_indexes', arkham_cards, build_card_indexes)
+
+def get_pack_lookups():
+    """Get (pack_code_to_pack, pack_code_to_name) mappings for the current packs data."""
+    return get_derived('pack_lookups', get_packs(),
+                       lambda packs: ({pack['code']: pack for pack in packs}, {pack['code']: pack['name'] for pack in packs}))
 
 def load_card_evaluations():
     """Load card evaluations from CSV file and return a mapping from name to rating."""
     evaluations = {}
-    csv_path = os.path.join('card_evaluation', 'card_evaluations', 'CardEvaluations.csv')
+    csv_path = CARD_EVALUATIONS_FILE
     
     try:
         with open(csv_path, 'r', encoding='utf-8') as file:
@@ -712,43 +1015,81 @@ def load_card_evaluations():
                 except ValueError:
                     # If rating can't be converted to int, default to 0
                     evaluations[name] = 0
-        print(f"Loaded {len(evaluations)} card evaluations")
+        LOG.info("Loaded %s card evaluations", len(evaluations))
     except FileNotFoundError:
-        print(f"Warning: Could not find CardEvaluations.csv at {csv_path}")
+        LOG.warning("Could not find CardEvaluations.csv at %s", csv_path)
     except Exception as e:
-        print(f"Error loading card evaluations: {e}")
+        LOG.error("Error loading card evaluations: %s", e)
     
     return evaluations
 
 def convert_to_draftmancer_format(arkham_cards, selected_pack_names):
     """Convert Arkham cards to Draftmancer custom card list format."""
-    # Load card evaluations
-    card_evaluations = load_card_evaluations()
-    
     # Get pack data to map pack names to pack codes
+    # (get_packs already falls back to fetching from the API on a cache miss)
     packs_data = get_packs()
-    if not packs_data:
-        packs_data = fetch_and_cache_packs()
-    
     if not packs_data:
         return {"error": "Unable to load pack data"}
     
-    # Create a mapping from pack name to pack code
-    pack_name_to_code = {pack['name']: pack['code'] for pack in packs_data}
+    # Mapping from pack name to pack code, built once per packs data
+    pack_name_to_code = get_derived('pack_name_to_code', packs_data,
+                                    lambda packs: {pack['name']: pack['code'] for pack in packs})
     
     # Get pack codes for selected packs
-    selected_pack_codes = set()
-    for pack_name in selected_pack_names:
-        pack_code = pack_name_to_code.get(pack_name)
-        if pack_code:
-            selected_pack_codes.add(pack_code)
+    selected_pack_codes = {pack_name_to_code[pack_name] for pack_name in selected_pack_names
+                           if pack_name_to_code.get(pack_name)}
+    
+    # Nothing to convert if none of the selected names matched a pack
+    if not selected_pack_codes:
+        return {
+            "cards": [],
+            "count": 0,
+            "selected_packs": selected_pack_names,
+            "selected_pack_codes": selected_pack_codes
+        }
+    
+    # Reuse the cards converted for the same pack selection if the card data, pack data
+    # and card evaluations haven't changed since
+    try:
+        evaluations_mtime = os.stat(CARD_EVALUATIONS_FILE).st_mtime_ns
+    except OSError:
+        evaluations_mtime = None
+    memo_key = (frozenset(selected_pack_codes), evaluations_mtime)
+    memo_sources = (arkham_cards, packs_data)
+    cached_cards = memo_get(_draftmancer_cards_memo, _draftmancer_cards_memo_lock, memo_key, memo_sources)
+    if cached_cards is not None:
+        # Callers extend the card list, so hand out a copy
+        return {
+            "cards": list(cached_cards),
+            "count": len(cached_cards),
+            "selected_packs": selected_pack_names,
+            "selected_pack_codes": selected_pack_codes
+        }
+    
+    # Load card evaluations
+    card_evaluations = load_card_evaluations()
+    
+    # Cards indexed by code and by pack, so the lookups below are dict gets
+    # instead of repeated scans over every card
+    code_to_card, pack_to_positions, code_to_positions = get_card_indexes(arkham_cards)
     
     # Collect all required cards from deck_requirements and bonded_cards
     # These should be included even if they're from unselected packs
     required_card_codes = set()
+    # Codes that cards in the selected packs link to (their back faces)
+    linked_to_codes = set()
+    # Linked back cards by front card code, filled in the same pass
+    linked_back_lookup = {}
     
-    for card in arkham_cards:
-        if card.get('pack_code') in selected_pack_codes:
+    for pack_code in selected_pack_codes:
+        for position in pack_to_positions.get(pack_code, ()):
+            card = arkham_cards[position]
+            linked_to = card.get('linked_to_code')
+            if linked_to:
+                linked_to_codes.add(linked_to)
+                if linked_to.endswith('b') and linked_to in code_to_card:
+                    linked_back_lookup[card.get('code')] = code_to_card[linked_to]
+            
             # For investigators, collect deck requirements
             if card.get('type_code') == 'investigator':
                 deck_requirements = card.get('deck_requirements', {})
@@ -765,53 +1106,45 @@ def convert_to_draftmancer_format(arkham_cards, selected_pack_names):
                     if bonded_code:
                         required_card_codes.add(bonded_code)
 
-    # Filter cards from selected packs and exclude cards with XP > 0
-    # Also include required cards even if they're from unselected packs
-    filtered_cards = []
-    for card in arkham_cards:
-        card_code = card.get('code', '')
+    def is_draftable(card):
+        """Whether a card from the selected packs (or a required card) belongs in the cube."""
         is_from_selected_pack = card.get('pack_code') in selected_pack_codes
-        is_required_card = card_code in required_card_codes
+        is_required_card = card.get('code', '') in required_card_codes
+        if not (is_from_selected_pack or is_required_card):
+            return False
         
-        if is_from_selected_pack or is_required_card:
-            # Filter out cards with XP > 0
-            xp = card.get('xp', 0)
-            if xp is None or xp <= 0:
-                # Skip cards with 'b' suffix that are linked backs of other cards
-                code = card.get('code', '')
-                if code.endswith('b'):
-                    # Check if there's any card that links to this 'b' card
-                    front_card_exists = any(
-                        c.get('linked_to_code') == code 
-                        for c in arkham_cards if c.get('pack_code') in selected_pack_codes
-                    )
-                    if not front_card_exists:
-                        # This 'b' card is not a linked back, include it
-                        filtered_cards.append(card)
-                    # If it is a linked back, skip it (it will be used as back image)
-                else:
-                    filtered_cards.append(card)
-    
-    # Create a lookup for linked back cards
-    linked_back_lookup = {}
-    for card in arkham_cards:
-        card_code = card.get('code', '')
-        is_from_selected_pack = card.get('pack_code') in selected_pack_codes
-        is_required_card = card_code in required_card_codes
+        # Filter out cards with XP > 0
+        xp = card.get('xp', 0)
+        if xp is not None and xp > 0:
+            return False
         
-        if is_from_selected_pack or is_required_card:
+        # Skip cards with 'b' suffix that are linked backs of other cards
+        # (they are used as back images); other 'b' cards are included
+        code = card.get('code', '')
+        return not (code.endswith('b') and code in linked_to_codes)
+    
+    # Required cards can come from unselected packs, add their linked back cards too
+    for code in required_card_codes:
+        card = code_to_card.get(code)
+        if card:
             linked_to = card.get('linked_to_code')
-            if linked_to and linked_to.endswith('b'):
-                # Find the linked back card
-                back_card = next((c for c in arkham_cards if c.get('code') == linked_to), None)
-                if back_card:
-                    linked_back_lookup[card.get('code')] = back_card
+            if linked_to and linked_to.endswith('b') and linked_to in code_to_card:
+                linked_back_lookup[code] = code_to_card[linked_to]
+    
+    # Only cards from the selected packs and required cards can be drafted, so only
+    # visit those (in their original order) instead of filtering every card
+    candidate_positions = set()
+    for pack_code in selected_pack_codes:
+        candidate_positions.update(pack_to_positions.get(pack_code, ()))
+    for code in required_card_codes:
+        candidate_positions.update(code_to_positions.get(code, ()))
+    candidate_cards = [arkham_cards[position] for position in sorted(candidate_positions)]
     
     # Check for name conflicts among bonded cards to determine if we need unique names
     bonded_name_conflicts = set()
     name_count = {}
-    for card in filtered_cards:
-        if card.get('bonded_to'):
+    for card in candidate_cards:
+        if card.get('bonded_to') and is_draftable(card):
             name = card.get('name', '')
             name_count[name] = name_count.get(name, 0) + 1
     
@@ -820,9 +1153,16 @@ def convert_to_draftmancer_format(arkham_cards, selected_pack_names):
         if count > 1:
             bonded_name_conflicts.add(name)
     
-    # Convert  to Draftmancer format for CustomCards section
-    draftmancer_cards = []
-    for card in filtered_cards:
+    # Bind hot lookups to locals once rather than resolving module globals for every card
+    faction_colors_get = FACTION_COLOR_MAP.get
+    type_get = TYPE_CODE_MAP.get
+    base_url = ARKHAMDB_BASE_URL
+    
+    def to_draftmancer_card(card):
+        """Build the Draftmancer CustomCards entry for a single card."""
+        type_code = card.get('type_code')
+        card_type = type_get(type_code, 'Instant')
+        
         # Convert cost to string, handle special cases
         cost = card.get('cost')
         if cost == -2:
@@ -841,19 +1181,26 @@ def convert_to_draftmancer_format(arkham_cards, selected_pack_names):
         # Get rating from card evaluations, default to 0 if not found
         card_rating = card_evaluations.get(card_name, 0)
         
+        # Image URL formatting and non-investigator colors are inlined to skip a function call per card
+        image_src = card.get('imagesrc', '')
+        if type_code == 'investigator':
+            colors = get_investigator_colors(card)
+        else:
+            colors = faction_colors_get(card.get('faction_code') or 'neutral', ())
+        
         draftmancer_card = {
             "name": card_name,
-            "image": format_image_url(card.get('imagesrc', '')),
-            "colors": get_investigator_colors(card),
+            "image": (image_src if image_src.startswith('http') else base_url + image_src) if image_src else '',
+            "colors": colors,
             "mana_cost": mana_cost_str,
-            "type": TYPE_CODE_MAP.get(card.get('type_code'), 'Instant'),
+            "type": card_type,
             "set": f"AH{card.get('pack_code', '').upper()}",
             "collector_number": str(card.get('code', '')),
             "rating": card_rating
         }
 
         # Add layout field for investigator cards
-        if card.get('type_code') == 'investigator':
+        if type_code == 'investigator':
             draftmancer_card["layout"] = "split_left"
         
         # Add related_cards based on deck_requirements (for investigators) and bonded_cards (for any card type)
@@ -861,7 +1208,7 @@ def convert_to_draftmancer_format(arkham_cards, selected_pack_names):
         draft_effect_cards = []  # Cards to add to drafter's pool via AddCards effect
         
         # Add deck_requirements related cards (only for investigators)
-        if card.get('type_code') == 'investigator':
+        if type_code == 'investigator':
             deck_requirements = card.get('deck_requirements', {})
             if 'card' in deck_requirements:
                 card_data = deck_requirements['card']
@@ -870,7 +1217,7 @@ def convert_to_draftmancer_format(arkham_cards, selected_pack_names):
                     related_card_codes = list(card_data.keys())
                     # Find the names of these cards
                     for code in related_card_codes:
-                        related_card = next((c for c in arkham_cards if c.get('code') == code), None)
+                        related_card = code_to_card.get(code)
                         if related_card:
                             card_name = related_card.get('name', '')
                             related_cards.append(card_name)
@@ -883,7 +1230,7 @@ def convert_to_draftmancer_format(arkham_cards, selected_pack_names):
             for bonded_card_info in bonded_cards:
                 bonded_code = bonded_card_info.get('code')
                 if bonded_code:
-                    bonded_card = next((c for c in arkham_cards if c.get('code') == bonded_code), None)
+                    bonded_card = code_to_card.get(bonded_code)
                     if bonded_card:
                         # Always use the unique name for bonded cards (check if they have name conflicts)
                         bonded_name = bonded_card.get('name', '')
@@ -901,7 +1248,7 @@ def convert_to_draftmancer_format(arkham_cards, selected_pack_names):
         draft_effects = []
         
         # Add FaceUp for investigators only
-        if card.get('type_code') == 'investigator':
+        if type_code == 'investigator':
             draft_effects.append("FaceUp")
             
         # Add AddCards effect if we have cards to add
@@ -920,134 +1267,45 @@ def convert_to_draftmancer_format(arkham_cards, selected_pack_names):
         if card_code in linked_back_lookup:
             # Use the linked back card's image
             back_card = linked_back_lookup[card_code]
+            back_image_src = back_card.get('imagesrc', '')
             back_card_data = {
                 "name": card.get('name', '') + " - back",
-                "image": format_image_url(back_card.get('imagesrc', '')),
-                "type": TYPE_CODE_MAP.get(card.get('type_code'), 'Instant')
+                "image": (back_image_src if back_image_src.startswith('http') else base_url + back_image_src) if back_image_src else '',
+                "type": card_type
             }
             # Add layout field for investigator back cards
-            if card.get('type_code') == 'investigator':
+            if type_code == 'investigator':
                 back_card_data["layout"] = "split_left"
             draftmancer_card["back"] = back_card_data
         elif card.get('backimagesrc'):
             # Use the standard backimagesrc
+            back_image_src = card['backimagesrc']
             back_card_data = {
                 "name": card.get('name', '') + " - back",
-                "image": format_image_url(card.get('backimagesrc', '')),
-                "type": TYPE_CODE_MAP.get(card.get('type_code'), 'Instant')
+                "image": back_image_src if back_image_src.startswith('http') else base_url + back_image_src,
+                "type": card_type
             }
             # Add layout field for investigator back cards
-            if card.get('type_code') == 'investigator':
+            if type_code == 'investigator':
                 back_card_data["layout"] = "split_left"
             draftmancer_card["back"] = back_card_data
         
-        draftmancer_cards.append(draftmancer_card)
+        return draftmancer_card
+    
+    # Convert to Draftmancer format for CustomCards section in a single fused
+    # filter-and-convert pass, without materializing an intermediate filtered list
+    draftmancer_cards = [to_draftmancer_card(card) for card in candidate_cards if is_draftable(card)]
+    
+    memo_put(_draftmancer_cards_memo, _draftmancer_cards_memo_lock, memo_key, memo_sources,
+             tuple(draftmancer_cards), DRAFTMANCER_CARDS_MEMO_SIZE)
     
     return {
         "cards": draftmancer_cards,
         "count": len(draftmancer_cards),
         "selected_packs": selected_pack_names,
-        "selected_pack_codes": selected_pack_codes,
-        "filtered_cards": filtered_cards  # Include filtered cards for MainSlot generation
+        "selected_pack_codes": selected_pack_codes
     }
 
-def generate_player_cards(selected_pack_codes, pack_quantities=None, excluded_cards=None, taboo_modifications=None, unique_cards_only=False):
-    """Generate the PlayerCards section with actual card quantities from pack data, separated by set."""
-    # Dictionary to track card quantities by (card_name, pack_code, collector_number) tuples
-    card_set_quantities = {}
-    
-    # Get the main cards cache to verify which cards are player cards
-    main_cards = get_arkham_cards()
-    player_card_codes = set(card.get('code') for card in main_cards if card.get('code'))
-    
-    # Create pack code to name mapping for quantity lookup
-    packs_data = get_packs()
-    pack_code_to_name = {pack['code']: pack['name'] for pack in packs_data} if packs_data else {}
-    
-    # Initialize excluded and forbidden cards sets
-    if excluded_cards is None:
-        excluded_cards = set()
-    
-    # Extract forbidden cards from taboo modifications
-    if taboo_modifications:
-        forbidden_cards = set(code for code, mods in taboo_modifications.items() 
-                             if any('Forbidden' in mod.get('text', '') for mod in mods))
-    else:
-        forbidden_cards = set()
-    
-    # Fetch pack-specific card data for each selected pack
-    for pack_code in selected_pack_codes:
-        pack_cards = get_pack_cards(pack_code)
-        
-        # Get the multiplier for this pack (default to 1 if not specified)
-        pack_name = pack_code_to_name.get(pack_code, pack_code)
-        pack_multiplier = pack_quantities.get(pack_name, 1) if pack_quantities else 1
-        
-        for card in pack_cards:
-            # Only include cards that exist in the main cards cache (player cards)
-            card_code = card.get('code', '')
-            if card_code not in player_card_codes:
-                continue
-            
-            # Skip forbidden cards from taboo list
-            if card_code in forbidden_cards:
-                continue
-                
-            # Skip cards that are bonded to other cards
-            if card.get('bonded_to'):
-                continue
-            # Skip investigators and cards with restrictions field
-            if card.get('type_code') == 'investigator':
-                continue
-            if 'restrictions' in card and card['restrictions']:
-                continue
-            # Skip basic weakness cards
-            if card.get('subtype_code') == 'basicweakness':
-                continue
-            # Skip cards with XP > 0 (considering taboo modifications)
-            xp = apply_taboo_xp_modification(card, taboo_modifications)
-            if xp is not None and xp > 0:
-                continue
-            
-            card_name = card.get('name', '')
-            
-            # Skip excluded cards
-            if excluded_cards and card_name.lower() in excluded_cards:
-                continue
-            
-            collector_number = str(card.get('code', ''))
-            base_quantity = card.get('quantity', 0)
-            final_quantity = base_quantity * pack_multiplier
-            
-            if card_name and final_quantity > 0:
-                # Create a key combining card name, pack code, and collector number
-                card_set_key = (card_name, pack_code, collector_number)
-                
-                if card_set_key in card_set_quantities:
-                    card_set_quantities[card_set_key] += final_quantity
-                else:
-                    card_set_quantities[card_set_key] = final_quantity
-    
-    # Generate player cards lines with actual quantities, separated by set
-    card_entries = []
-    
-    if unique_cards_only:
-        # For unique cards only, track card names to ensure no duplicates
-        unique_card_names = set()
-        for (card_name, pack_code, collector_number), total_quantity in card_set_quantities.items():
-            if card_name not in unique_card_names:
-                unique_card_names.add(card_name)
-                card_entries.append(f"1 {card_name} (AH{pack_code.upper()}) {collector_number}")
-    else:
-        # Normal behavior: include all quantities
-        for (card_name, pack_code, collector_number), total_quantity in card_set_quantities.items():
-            card_entries.append(f"{total_quantity} {card_name} (AH{pack_code.upper()}) {collector_number}")
-    
-    # Sort the entries by card name (ignoring quantity and set)
-    card_entries.sort(key=lambda x: x.split(' ', 1)[1].split(' (AH')[0])
-    
-    return card_entries
-
 def get_taboo_modifications(taboo_id):
     """Get a dictionary of card code to taboo modifications from the specified taboo list."""
     if not taboo_id:
@@ -1070,12 +1328,16 @@ def get_taboo_modifications(taboo_id):
     if not selected_taboo:
         return {}
     
+    # Parsed once per taboo list object, so the same dict comes back while the taboo cache is unchanged
+    return get_derived(('taboo_modifications', taboo_id), selected_taboo, parse_taboo_modifications)
+
+def parse_taboo_modifications(selected_taboo):
+    """Parse a taboo list's cards JSON into a dictionary of card code to taboo modifications."""
     taboo_modifications = {}
     
     try:
         # Parse the cards JSON string
-        import json
-        cards_data = json.loads(selected_taboo.get('cards', '[]'))
+        cards_data = orjson.loads(selected_taboo.get('cards', '[]'))
         
         for card_modification in cards_data:
             code = card_modification.get('code')
@@ -1084,7 +1346,7 @@ def get_taboo_modifications(taboo_id):
                     taboo_modifications[code] = []
                 taboo_modifications[code].append(card_modification)
     except (json.JSONDecodeError, KeyError) as e:
-        print(f"Error parsing taboo list cards: {e}")
+        LOG.error("Error parsing taboo list cards: %s", e)
         return {}
     
     return taboo_modifications
@@ -1124,241 +1386,210 @@ def apply_taboo_xp_modification(card, taboo_modifications):
     
     return base_xp + total_xp_change
 
-def generate_investigators_cards(selected_pack_codes, pack_quantities=None, excluded_cards=None, taboo_modifications=None, unique_cards_only=False):
-    """Generate the Investigators section with unique cards by name+set, except Core/Revised Core are treated as same set."""
-    # Dictionary to track cards by (name, normalized_pack): card_name -> {normalized_pack -> (card_data, pack_data)}
-    cards_by_name_and_pack = {}
+def generate_pack_card_sections(selected_pack_codes, pack_quantities=None, excluded_cards=None, taboo_modifications=None, unique_cards_only=False, arkham_cards=None):
+    """Generate the Investigators, BasicWeaknesses and PlayerCards sections in a single pass over the selected packs.
+    
+    Pass arkham_cards when the caller already has the main cards loaded.
+    Returns (investigators_cards, basic_weaknesses_cards, player_cards).
+    """
+    # Investigators unique by name+set (Core/Revised Core treated as same set): card_name -> {normalized_pack -> (card_data, priority)}
+    investigators_by_name_and_pack = {}
+    # Best basic weakness by name: card_name -> (card_data, priority)
+    best_weaknesses_by_name = {}
+    # Player card quantities by (card_name, pack_code, collector_number) tuples
+    card_set_quantities = Counter()
     
     # Get the main cards cache to verify which cards are player cards
-    main_cards = get_arkham_cards()
-    player_card_codes = set(card.get('code') for card in main_cards if card.get('code'))
+    player_card_codes = get_player_card_codes(arkham_cards)
     
-    # Initialize excluded cards and taboo modifications
+    # Get pack data for priority logic and pack code to name mapping for quantity lookup
+    pack_code_to_pack, pack_code_to_name = get_pack_lookups()
+    
+    # Initialize excluded and forbidden cards sets
     if excluded_cards is None:
         excluded_cards = set()
-    if taboo_modifications is None:
-        taboo_modifications = {}
     
-    # Get forbidden cards from taboo modifications
-    forbidden_cards = set()
+    # Extract forbidden cards from taboo modifications
     if taboo_modifications:
-        for code, mods in taboo_modifications.items():
-            for mod in mods:
-                if 'Forbidden' in mod.get('text', ''):
-                    forbidden_cards.add(code)
-                    break
-    
-    # Get pack data for priority logic
-    packs_data = get_packs()
-    pack_code_to_pack = {pack['code']: pack for pack in packs_data} if packs_data else {}
-    pack_code_to_name = {pack['code']: pack['name'] for pack in packs_data} if packs_data else {}
-    
-    def normalize_pack_code(pack_code):
-        """Normalize pack codes so that 'core' and 'rcore' are treated as the same."""
-        if pack_code in ['core', 'rcore']:
-            return 'core'  # Treat both as 'core'
-        return pack_code
+        forbidden_cards = set(code for code, mods in taboo_modifications.items() 
+                             if any('Forbidden' in mod.get('text', '') for mod in mods))
+    else:
+        forbidden_cards = set()
     
-    # Fetch pack-specific card data for each selected pack
+    # Fetch pack-specific card data for each selected pack, any missing packs all at once
+    prefetch_pack_cards(selected_pack_codes)
     for pack_code in selected_pack_codes:
         pack_cards = get_pack_cards(pack_code)
-        pack_data = pack_code_to_pack.get(pack_code, {})
         
-        for card in pack_cards:
-            # Only include cards that exist in the main cards cache (player cards)
-            card_code = card.get('code', '')
-            if card_code not in player_card_codes:
-                continue
-            
-            # Skip forbidden cards from taboo list
-            if card_code in forbidden_cards:
-                continue
-                
-            # Skip cards that are bonded to other cards
-            if card.get('bonded_to'):
-                continue
-            # Only include investigators
-            if card.get('type_code') != 'investigator':
-                continue
-            
-            card_name = card.get('name', '')
-            if not card_name:
-                continue
-            
-            # Skip excluded cards
-            if excluded_cards and card_name.lower() in excluded_cards:
-                continue
-            
-            # Normalize the pack code (core/rcore treated as same)
-            normalized_pack = normalize_pack_code(pack_code)
-            
-            # Initialize nested dictionary if needed
-            if card_name not in cards_by_name_and_pack:
-                cards_by_name_and_pack[card_name] = {}
+        # Core and Revised Core are treated as the same set for investigators
+        normalized_pack = 'core' if pack_code in ['core', 'rcore'] else pack_code
+        
+        # Get the multiplier for this pack (default to 1 if not specified)
+        pack_name = pack_code_to_name.get(pack_code, pack_code)
+        pack_multiplier = pack_quantities.get(pack_name, 1) if pack_quantities else 1
+        
+        priority, investigators, weaknesses, unit_quantities = scan_pack_cards(
+            pack_code, pack_cards, player_card_codes, pack_code_to_pack, excluded_cards, forbidden_cards, taboo_modifications)
+        
+        for card_name, card in investigators.items():
+            # Keep the highest priority version for this name+pack combination
+            versions = investigators_by_name_and_pack.setdefault(card_name, {})
+            current = versions.get(normalized_pack)
+            if current is None or priority > current[1]:
+                versions[normalized_pack] = (card, priority)
+        
+        for card_name, card in weaknesses.items():
+            # Keep the highest priority version for this name
+            current = best_weaknesses_by_name.get(card_name)
+            if current is None or priority > current[1]:
+                best_weaknesses_by_name[card_name] = (card, priority)
+        
+        if pack_multiplier > 0:
+            for card_key, base_quantity in unit_quantities.items():
+                card_set_quantities[card_key] += base_quantity * pack_multiplier
+    
+    return (
+        format_investigators_cards(investigators_by_name_and_pack, unique_cards_only),
+        format_basic_weaknesses_cards(best_weaknesses_by_name),
+        format_player_cards(card_set_quantities, unique_cards_only),
+    )
+
+def scan_pack_cards(pack_code, pack_cards, player_card_codes, pack_code_to_pack, excluded_cards, forbidden_cards, taboo_modifications):
+    """Filter one pack's cards down to what the draft sheets can use, at a quantity of 1 copy of the pack.
+    
+    Returns (priority, investigators, weaknesses, unit_quantities): the pack's priority when several
+    versions of a card compete, the first investigator and basic weakness of each name, and the player
+    card quantities by (card_name, pack_code, collector_number). The result only depends on the pack,
+    not on how many copies were selected, so it is reused across drafts that share the pack.
+    """
+    memo_key = (pack_code, frozenset(excluded_cards), id(taboo_modifications) if taboo_modifications else None)
+    memo_sources = (pack_cards, player_card_codes, pack_code_to_pack, taboo_modifications or None)
+    cached = memo_get(_pack_card_scan_memo, _pack_card_scan_memo_lock, memo_key, memo_sources)
+    if cached is not None:
+        return cached
+    
+    # Priority of this pack when several versions of a card compete:
+    # 1. Revised core set (pack_code == 'rcore') wins
+    # 2. Otherwise, highest cycle_position wins
+    # 3. If cycle_position is tied, highest position wins
+    pack_data = pack_code_to_pack.get(pack_code, {})
+    priority = (pack_code == 'rcore', pack_data.get('cycle_position', 0), pack_data.get('position', 0))
+    
+    investigators = {}
+    weaknesses = {}
+    unit_quantities = Counter()
+    
+    for card in pack_cards:
+        # Only include cards that exist in the main cards cache (player cards)
+        card_code = card.get('code', '')
+        if card_code not in player_card_codes:
+            continue
+        
+        # Skip forbidden cards from taboo list
+        if card_code in forbidden_cards:
+            continue
             
-            # Check if this is a better version for this name+pack combination
-            if normalized_pack not in cards_by_name_and_pack[card_name]:
-                cards_by_name_and_pack[card_name][normalized_pack] = (card, pack_data)
-            else:
-                current_card, current_pack = cards_by_name_and_pack[card_name][normalized_pack]
-                
-                # Priority logic for same name+pack:
-                # 1. Revised core set (pack_code == 'rcore') wins over core
-                # 2. Otherwise, highest cycle_position wins
-                # 3. If cycle_position is tied, highest position wins
-                
-                if pack_code == 'rcore' and current_pack.get('code') == 'core':
-                    # New card is from revised core, current is from core - upgrade
-                    cards_by_name_and_pack[card_name][normalized_pack] = (card, pack_data)
-                elif current_pack.get('code') == 'rcore' and pack_code == 'core':
-                    # Current card is from revised core, new is from core - keep current
-                    pass
-                else:
-                    # Compare by cycle_position and position
-                    current_cycle = current_pack.get('cycle_position', 0)
-                    current_pos = current_pack.get('position', 0)
-                    new_cycle = pack_data.get('cycle_position', 0)
-                    new_pos = pack_data.get('position', 0)
-                    
-                    if (new_cycle > current_cycle) or (new_cycle == current_cycle and new_pos > current_pos):
-                        cards_by_name_and_pack[card_name][normalized_pack] = (card, pack_data)
-    
-    # Generate investigators lines (no quantities, unique by name+pack)
+        # Skip cards that are bonded to other cards
+        if card.get('bonded_to'):
+            continue
+        
+        card_name = card.get('name', '')
+        if not card_name:
+            continue
+        
+        # Skip excluded cards
+        if excluded_cards and card_name.lower() in excluded_cards:
+            continue
+        
+        if card.get('type_code') == 'investigator':
+            # Every version in a pack shares its priority, so the first one wins
+            investigators.setdefault(card_name, card)
+            continue
+        
+        if card.get('subtype_code') == 'basicweakness':
+            weaknesses.setdefault(card_name, card)
+            continue
+        
+        # Skip player cards with restrictions field
+        if 'restrictions' in card and card['restrictions']:
+            continue
+        # Skip cards with XP > 0 (considering taboo modifications)
+        xp = apply_taboo_xp_modification(card, taboo_modifications)
+        if xp is not None and xp > 0:
+            continue
+        
+        base_quantity = card.get('quantity', 0)
+        if base_quantity > 0:
+            # Key combining card name, pack code, and collector number
+            unit_quantities[(card_name, pack_code, str(card_code))] += base_quantity
+    
+    result = (priority, investigators, weaknesses, unit_quantities)
+    memo_put(_pack_card_scan_memo, _pack_card_scan_memo_lock, memo_key, memo_sources, result, PACK_CARD_SCAN_MEMO_SIZE)
+    return result
+
+def format_investigators_cards(investigators_by_name_and_pack, unique_cards_only=False):
+    """Format the Investigators section lines (no quantities, unique by name+pack)."""
     card_entries = []
     
     if unique_cards_only:
-        # For unique cards only, track card names to ensure no duplicates across all packs
-        unique_card_names = set()
-        for card_name, pack_dict in cards_by_name_and_pack.items():
-            if card_name not in unique_card_names:
-                unique_card_names.add(card_name)
-                # Pick the first/best pack version for this card name
-                for normalized_pack, (card, pack_data) in pack_dict.items():
-                    collector_number = str(card.get('code', ''))
-                    pack_code = card.get('pack_code', '')
-                    card_entries.append(f"1 {card_name} (AH{pack_code.upper()}) {collector_number}")
-                    break  # Only take the first pack version for this card name
+        # For unique cards only, take just the first pack version of each card name
+        for card_name, pack_dict in investigators_by_name_and_pack.items():
+            card, _ = next(iter(pack_dict.values()))
+            collector_number = str(card.get('code', ''))
+            pack_code = card.get('pack_code', '').upper()
+            card_entries.append(((card_name, pack_code), f"1 {card_name} (AH{pack_code}) {collector_number}"))
     else:
         # Normal behavior: include all pack versions
-        for card_name, pack_dict in cards_by_name_and_pack.items():
-            for normalized_pack, (card, pack_data) in pack_dict.items():
+        for card_name, pack_dict in investigators_by_name_and_pack.items():
+            for card, _ in pack_dict.values():
                 collector_number = str(card.get('code', ''))
-                pack_code = card.get('pack_code', '')
-                card_entries.append(f"1 {card_name} (AH{pack_code.upper()}) {collector_number}")
+                pack_code = card.get('pack_code', '').upper()
+                card_entries.append(((card_name, pack_code), f"1 {card_name} (AH{pack_code}) {collector_number}"))
     
-    # Sort the entries by card name, then by pack code
-    card_entries.sort(key=lambda x: (x.split(' ', 1)[1].split(' (AH')[0], x.split('(AH')[1].split(')')[0]))
+    # Sort the entries by card name, then by pack code, using the keys kept alongside
+    # each line instead of parsing them back out of the formatted text
+    card_entries.sort(key=itemgetter(0))
     
-    return card_entries
+    return [entry for _, entry in card_entries]
 
-def generate_basic_weaknesses_cards(selected_pack_codes, pack_quantities=None, excluded_cards=None, taboo_modifications=None, unique_cards_only=False):
-    """Generate the BasicWeaknesses section with unique cards by name, prioritizing revised core then most recent."""
-    # Dictionary to track best card by name: card_name -> (card_data, pack_data)
-    best_cards_by_name = {}
-    
-    # Get the main cards cache to verify which cards are player cards
-    main_cards = get_arkham_cards()
-    player_card_codes = set(card.get('code') for card in main_cards if card.get('code'))
-    
-    # Get pack data for priority logic
-    packs_data = get_packs()
-    pack_code_to_pack = {pack['code']: pack for pack in packs_data} if packs_data else {}
-    pack_code_to_name = {pack['code']: pack['name'] for pack in packs_data} if packs_data else {}
-    
-    # Initialize excluded and forbidden cards sets
-    if excluded_cards is None:
-        excluded_cards = set()
-    
-    # Extract forbidden cards from taboo modifications
-    if taboo_modifications:
-        forbidden_cards = set(code for code, mods in taboo_modifications.items() 
-                             if any('Forbidden' in mod.get('text', '') for mod in mods))
-    else:
-        forbidden_cards = set()
-    
-    # Fetch pack-specific card data for each selected pack
-    for pack_code in selected_pack_codes:
-        pack_cards = get_pack_cards(pack_code)
-        pack_data = pack_code_to_pack.get(pack_code, {})
-        
-        for card in pack_cards:
-            # Only include cards that exist in the main cards cache (player cards)
-            card_code = card.get('code', '')
-            if card_code not in player_card_codes:
-                continue
-            
-            # Skip forbidden cards from taboo list
-            if card_code in forbidden_cards:
-                continue
-                
-            # Skip cards that are bonded to other cards
-            if card.get('bonded_to'):
-                continue
-            # Only include basic weakness cards
-            if card.get('subtype_code') != 'basicweakness':
-                continue
-            
-            card_name = card.get('name', '')
-            if not card_name:
-                continue
-            
-            # Skip excluded cards
-            if excluded_cards and card_name.lower() in excluded_cards:
-                continue
-            
-            # Check if this is a better version than what we have
-            if card_name not in best_cards_by_name:
-                best_cards_by_name[card_name] = (card, pack_data)
-            else:
-                current_card, current_pack = best_cards_by_name[card_name]
-                
-                # Priority logic:
-                # 1. Revised core set (pack_code == 'rcore') wins
-                # 2. Otherwise, highest cycle_position wins
-                # 3. If cycle_position is tied, highest position wins
-                
-                if pack_code == 'rcore' and current_pack.get('code') != 'rcore':
-                    # New card is from revised core, current is not
-                    best_cards_by_name[card_name] = (card, pack_data)
-                elif current_pack.get('code') == 'rcore' and pack_code != 'rcore':
-                    # Current card is from revised core, new is not - keep current
-                    pass
-                else:
-                    # Neither or both are revised core, compare by cycle_position and position
-                    current_cycle = current_pack.get('cycle_position', 0)
-                    current_pos = current_pack.get('position', 0)
-                    new_cycle = pack_data.get('cycle_position', 0)
-                    new_pos = pack_data.get('position', 0)
-                    
-                    if (new_cycle > current_cycle) or (new_cycle == current_cycle and new_pos > current_pos):
-                        best_cards_by_name[card_name] = (card, pack_data)
-    
-    # Generate basic weaknesses lines (no quantities, just unique cards)
+def format_basic_weaknesses_cards(best_weaknesses_by_name):
+    """Format the BasicWeaknesses section lines (no quantities, just unique cards)."""
     # Note: Basic weaknesses are already unique by name, so unique_cards_only doesn't change behavior
     card_entries = []
-    for card_name, (card, pack_data) in best_cards_by_name.items():
+    for card_name, (card, _) in best_weaknesses_by_name.items():
         collector_number = str(card.get('code', ''))
         pack_code = card.get('pack_code', '')
-        card_entries.append(f"1 {card_name} (AH{pack_code.upper()}) {collector_number}")
+        card_entries.append((card_name, f"1 {card_name} (AH{pack_code.upper()}) {collector_number}"))
     
     # Sort the entries by card name
-    card_entries.sort(key=lambda x: x.split(' ', 1)[1].split(' (AH')[0])
+    card_entries.sort(key=itemgetter(0))
     
-    return card_entries
+    return [entry for _, entry in card_entries]
 
-def generate_draftmancer_file_content(cards, investigators_cards, basic_weaknesses_cards, player_cards, selected_pack_names, 
-                                     investigators_per_pack=3, basic_weaknesses_per_pack=3, player_cards_per_pack=15, player_card_packs_per_player=3):
-    """Generate the complete Draftmancer file content in .txt format."""
-    lines = []
+def format_player_cards(card_set_quantities, unique_cards_only=False):
+    """Format the PlayerCards section lines with actual quantities, separated by set."""
+    card_entries = []
     
-    # CustomCards section
-    lines.append("[CustomCards]")
-    import json
-    lines.append(json.dumps(cards, indent=2, ensure_ascii=False))
+    if unique_cards_only:
+        # For unique cards only, track card names to ensure no duplicates
+        unique_card_names = set()
+        for (card_name, pack_code, collector_number), total_quantity in card_set_quantities.items():
+            if card_name not in unique_card_names:
+                unique_card_names.add(card_name)
+                card_entries.append((card_name, f"1 {card_name} (AH{pack_code.upper()}) {collector_number}"))
+    else:
+        # Normal behavior: include all quantities
+        for (card_name, pack_code, collector_number), total_quantity in card_set_quantities.items():
+            card_entries.append((card_name, f"{total_quantity} {card_name} (AH{pack_code.upper()}) {collector_number}"))
     
-    # Settings section  
-    lines.append("[Settings]")
+    # Sort the entries by card name (ignoring quantity and set)
+    card_entries.sort(key=itemgetter(0))
     
+    return [entry for _, entry in card_entries]
+
+@lru_cache(maxsize=64)
+def format_draftmancer_settings(investigators_per_pack, basic_weaknesses_per_pack, player_cards_per_pack, player_card_packs_per_player):
+    """Format the Settings section, which only depends on the pack layout so is built once per layout."""
     # Generate predeterminedLayouts based on player_card_packs_per_player
     predetermined_layouts = ["Investigators", "BasicWeaknesses"]
     for _ in range(player_card_packs_per_player):
@@ -1391,7 +1622,21 @@ def generate_draftmancer_file_content(cards, investigators_cards, basic_weakness
         "withReplacement": False,
         "colorcolorBalance": True,
     }
-    lines.append(json.dumps(settings, indent=4))
+    return json.dumps(settings, indent=4)
+
+def generate_draftmancer_file_content(cards, investigators_cards, basic_weaknesses_cards, player_cards, selected_pack_names, 
+                                     investigators_per_pack=3, basic_weaknesses_per_pack=3, player_cards_per_pack=15, player_card_packs_per_player=3):
+    """Generate the complete Draftmancer file content in .txt format."""
+    lines = []
+    
+    # CustomCards section
+    lines.append("[CustomCards]")
+    # orjson's 2-space indent matches json.dumps(indent=2, ensure_ascii=False) and is much faster
+    lines.append(orjson.dumps(cards, option=orjson.OPT_INDENT_2).decode())
+    
+    # Settings section  
+    lines.append("[Settings]")
+    lines.append(format_draftmancer_settings(investigators_per_pack, basic_weaknesses_per_pack, player_cards_per_pack, player_card_packs_per_player))
     
     # Investigators section
     lines.append("[Investigators]")
@@ -1409,59 +1654,33 @@ def generate_draftmancer_file_content(cards, investigators_cards, basic_weakness
 
 def get_packs_with_player_cards():
     """Get set of pack codes that contain player cards."""
-    # Check if we have valid cards cache
-    if is_cache_valid(CARDS_CACHE_FILE):
-        print("Using cached cards data to determine player card packs")
-        cards_data = load_cached_cards()
-        if cards_data:
-            pack_player_card_counts = {}
-            
-            for card in cards_data:
-                pack_code = card.get('pack_code')
-                card_type = card.get('type_code')
-                
-                # Player cards are: investigator, asset, event, skill, and basic weakness treacheries
-                player_card_types = {'investigator', 'asset', 'event', 'skill'}
-                
-                # Also include player treacheries (basic weaknesses)
-                if card_type == 'treachery' and card.get('subtype_code') == 'basicweakness':
-                    player_card_types.add('treachery')
-                
-                if card_type in player_card_types:
-                    if pack_code not in pack_player_card_counts:
-                        pack_player_card_counts[pack_code] = 0
-                    pack_player_card_counts[pack_code] += 1
-            
-            # Return set of pack codes that have player cards
-            return set(pack_code for pack_code, count in pack_player_card_counts.items() if count > 0)
-    
-    # If no cards cache, fetch from API
-    cards_data = fetch_and_cache_cards()
-    if cards_data:
-        pack_player_card_counts = {}
-        
-        for card in cards_data:
-            pack_code = card.get('pack_code')
-            card_type = card.get('type_code')
-            
-            # Player cards are: investigator, asset, event, skill, and basic weakness treacheries
-            player_card_types = {'investigator', 'asset', 'event', 'skill'}
-            
-            # Also include player treacheries (basic weaknesses)
-            if card_type == 'treachery' and card.get('subtype_code') == 'basicweakness':
-                player_card_types.add('treachery')
-            
-            if card_type in player_card_types:
-                if pack_code not in pack_player_card_counts:
-                    pack_player_card_counts[pack_code] = 0
-                pack_player_card_counts[pack_code] += 1
-        
-        # Return set of pack codes that have player cards
-        return set(pack_code for pack_code, count in pack_player_card_counts.items() if count > 0)
+    # Uses the same cache-or-fetch path as everything else, so a stale cache is
+    # served (and refreshed in the background) instead of blocking on the API
+    cards_data = get_arkham_cards()
+    if not cards_data:
+        # If all fails, return empty set (will show no packs)
+        LOG.warning("Unable to determine packs with player cards")
+        return set()
     
-    # If all fails, return empty set (will show no packs)
-    print("Unable to determine packs with player cards")
-    return set()
+    return get_derived('packs_with_player_cards', cards_data, find_packs_with_player_cards)
+
+def find_packs_with_player_cards(cards_data):
+    """Collect the codes of packs that contain at least one player card."""
+    # Player cards are: investigator, asset, event, skill, and basic weakness treacheries
+    player_card_types = {'investigator', 'asset', 'event', 'skill'}
+    pack_codes = set()
+    
+    for card in cards_data:
+        card_type = card.get('type_code')
+        if card_type in player_card_types or (card_type == 'treachery' and card.get('subtype_code') == 'basicweakness'):
+            pack_codes.add(card.get('pack_code'))
+    
+    return pack_codes
+
+def get_sorted_packs(packs_data):
+    """Get packs sorted by cycle_position first, then by position, sorting once per packs data."""
+    return get_derived('sorted_packs', packs_data,
+                       lambda packs: sorted(packs, key=lambda pack: (pack.get('cycle_position', 99), pack.get('position', 99))))
 
 def get_arkham_sets_grouped():
     """Get Arkham Horror sets grouped by cycle, filtered to only include packs with player cards."""
@@ -1471,17 +1690,21 @@ def get_arkham_sets_grouped():
     # Get packs data using the standard caching mechanism
     packs_data = get_packs()
     if packs_data:
-        # Filter to only include packs with player cards
-        filtered_packs = [pack for pack in packs_data if pack.get('code') in player_card_pack_codes]
-        print(f"Filtered {len(packs_data)} total packs to {len(filtered_packs)} packs with player cards")
-        # Sort packs by cycle_position first, then by position
-        sorted_packs = sorted(filtered_packs, key=lambda pack: (pack.get('cycle_position', 99), pack.get('position', 99)))
-        return group_packs_by_cycle(sorted_packs)
+        # Only regroup when the packs or the cards data have changed
+        return get_derived('arkham_sets_grouped', (packs_data, player_card_pack_codes),
+                           lambda sources: filter_and_group_packs(*sources))
     
     # All methods failed
-    print("All methods failed, unable to load pack data")
+    LOG.error("All methods failed, unable to load pack data")
     return None
 
+def filter_and_group_packs(packs_data, player_card_pack_codes):
+    """Group the packs that contain player cards by cycle."""
+    # Filter the (already sorted) packs to only include packs with player cards
+    sorted_packs = [pack for pack in get_sorted_packs(packs_data) if pack.get('code') in player_card_pack_codes]
+    LOG.info("Filtered %s total packs to %s packs with player cards", len(packs_data), len(sorted_packs))
+    return group_packs_by_cycle(sorted_packs)
+
 def group_packs_by_cycle(packs_data):
     """Group packs by cycle_position and return structured data."""
     cycles = {}
@@ -1524,14 +1747,50 @@ def get_arkham_sets():
     # Get packs data using the standard caching mechanism
     packs_data = get_packs()
     if packs_data:
-        # Sort packs by cycle_position first, then by position
-        sorted_packs = sorted(packs_data, key=lambda pack: (pack.get('cycle_position', 99), pack.get('position', 99)))
-        return [pack['name'] for pack in sorted_packs]
+        return [pack['name'] for pack in get_sorted_packs(packs_data)]
     
     # All methods failed
-    print("All methods failed, unable to load pack data")
+    LOG.error("All methods failed, unable to load pack data")
     return []
 
+def get_cache_version(cache_file):
+    """Identify the contents of a cache file by the HTTP validators it was saved with, which
+    (unlike its modification time) stay the same when an unchanged response renews it.
+    Falls back to the modification time for caches saved without validators."""
+    mtime = os.stat(cache_file).st_mtime_ns
+    validators = read_cache_validators(cache_file)
+    return validators.get('etag') or validators.get('last_modified') or format(mtime, 'x')
+
+def get_index_etag():
+    """ETag for the index page from the versions of the caches and template it's rendered from."""
+    try:
+        versions = [get_cache_version(path) for path in (PACKS_CACHE_FILE, CARDS_CACHE_FILE, TABOO_CACHE_FILE)]
+        versions.append(format(os.stat(os.path.join(app.root_path, app.template_folder, 'index.html')).st_mtime_ns, 'x'))
+    except OSError:
+        # A cache isn't on disk yet (or is still the legacy file), don't cache the page
+        return None
+    # Upstream ETags may contain quotes, hash the versions into a plain token
+    return hashlib.sha1('\0'.join(versions).encode()).hexdigest()
+
+@app.after_request
+def gzip_response(response):
+    """Gzip the large page and draft responses when the client accepts it, they are very repetitive text."""
+    if (not GZIP_RESPONSES or request.endpoint not in GZIP_ENDPOINTS or response.status_code != 200
+            or response.direct_passthrough or 'Content-Encoding' in response.headers
+            or not request.accept_encodings['gzip']):
+        return response
+    body = response.get_data()
+    if len(body) < RESPONSE_GZIP_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def orjson_response(payload, status=200):
+    """Build a JSON response with orjson, much faster than jsonify for the large cube text payloads."""
+    return app.response_class(orjson.dumps(payload), status=status, mimetype='application/json')
+
 @app.route('/')
 def index():
     arkham_sets_grouped = get_arkham_sets_grouped()
@@ -1541,7 +1800,18 @@ def index():
     # Load taboo lists
     taboo_lists = get_arkham_taboos()
     
-    return render_template('index.html', cycles=arkham_sets_grouped, taboos=taboo_lists)
+    # The page only changes when a cache it's built from (or the template) changes,
+    # so let browsers revalidate instead of re-rendering it on every visit. The ETag
+    # is weak because the gzipped and plain versions of the page share it
+    etag = get_index_etag()
+    if etag and request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = make_response(render_template('index.html', cycles=arkham_sets_grouped, taboos=taboo_lists))
+    if etag:
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
 
 @app.route('/deck-exporter')
 def deck_exporter():
@@ -1596,10 +1866,11 @@ def draft():
     taboo_list_id = request.form.get('tabooList', '').strip()
     taboo_modifications = get_taboo_modifications(taboo_list_id)
     
-    if taboo_modifications:
+    # Only count the forbidden cards when the message will actually be logged
+    if taboo_modifications and LOG.isEnabledFor(logging.INFO):
         forbidden_count = len([code for code, mods in taboo_modifications.items() 
                               if any('Forbidden' in mod.get('text', '') for mod in mods)])
-        print(f"Applying taboo list {taboo_list_id}: excluding {forbidden_count} forbidden cards")
+        LOG.info("Applying taboo list %s: excluding %s forbidden cards", taboo_list_id, forbidden_count)
     
     # Check for cards to include first
     cards_to_include_text = request.form.get('cardsToInclude', '').strip()
@@ -1608,23 +1879,22 @@ def draft():
         return render_template('draft_result.html', selected_sets=[], error="No sets selected and no cards to include specified")
 
     # Process pack quantities - get quantities for each selected pack
-    pack_quantities = {}
-    for pack_name in selected_sets:
-        quantity_key = f'quantity_{pack_name}'
-        quantity = int(request.form.get(quantity_key, 1))  # Default to 1 if not specified
-        pack_quantities[pack_name] = quantity
+    pack_quantities = parse_pack_quantities(request.form, selected_sets)
     
     # Parse excluded cards
     excluded_cards_text = request.form.get('cardsToExclude', '').strip()
     excluded_cards = parse_excluded_cards(excluded_cards_text)
     
+    # Load the cards once for the whole request
+    arkham_cards = get_arkham_cards()
+    
     # Parse cards to include (moved earlier for validation)
     try:
-        cards_to_include = parse_cards_to_include(cards_to_include_text)
-        if cards_to_include:
-            print(f"Including {len(cards_to_include)} custom cards: {list(cards_to_include.keys())}")
+        cards_to_include = parse_cards_to_include(cards_to_include_text, arkham_cards)
+        if cards_to_include and LOG.isEnabledFor(logging.INFO):
+            LOG.info("Including %s custom cards: %s", len(cards_to_include), list(cards_to_include.keys()))
     except Exception as e:
-        print(f"Error parsing cards to include: {e}")
+        LOG.error("Error parsing cards to include: %s", e)
         cards_to_include = {}
     
     # Parse layout options
@@ -1636,14 +1906,13 @@ def draft():
     
     # TODO: Implement unique cards logic when backend is ready
     if unique_cards_only:
-        print("Unique cards only setting enabled - limiting each card to appear at most once")
+        LOG.info("Unique cards only setting enabled - limiting each card to appear at most once")
     
     # Get all cards and convert to Draftmancer format
-    print(f"Generating Draftmancer format for {len(selected_sets)} selected sets with quantities: {pack_quantities}")
-    print(f"Layout: {investigators_per_pack} investigators, {basic_weaknesses_per_pack} weaknesses, {player_cards_per_pack} player cards per pack, {player_card_packs_per_player} player card packs per player")
-    if excluded_cards:
-        print(f"Excluding {len(excluded_cards)} cards: {list(excluded_cards)}")
-    arkham_cards = get_arkham_cards()
+    LOG.info("Generating Draftmancer format for %s selected sets with quantities: %s", len(selected_sets), pack_quantities)
+    LOG.info("Layout: %s investigators, %s weaknesses, %s player cards per pack, %s player card packs per player", investigators_per_pack, basic_weaknesses_per_pack, player_cards_per_pack, player_card_packs_per_player)
+    if excluded_cards and LOG.isEnabledFor(logging.INFO):
+        LOG.info("Excluding %s cards: %s", len(excluded_cards), list(excluded_cards))
 
     if not arkham_cards:
         return render_template('draft_result.html', selected_sets=selected_sets, 
@@ -1657,9 +1926,10 @@ def draft():
                                  error=draftmancer_data["error"])
 
         # Generate cards for all three sheets with actual quantities and pack multipliers
-        investigators_cards = generate_investigators_cards(draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only)
-        basic_weaknesses_cards = generate_basic_weaknesses_cards(draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only)
-        player_cards = generate_player_cards(draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only)
+        investigators_cards, basic_weaknesses_cards, player_cards = generate_pack_card_sections(
+            draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only,
+            arkham_cards=arkham_cards
+        )
         
         # Add cards to include to appropriate lists and get custom cards
         try:
@@ -1667,7 +1937,7 @@ def draft():
                 cards_to_include, investigators_cards, basic_weaknesses_cards, player_cards, arkham_cards
             )
         except Exception as e:
-            print(f"Error adding cards to include: {e}")
+            LOG.error("Error adding cards to include: %s", e)
             custom_cards = []
         
         # Add custom cards to draftmancer data
@@ -1689,8 +1959,7 @@ def draft():
         )
         
         # Generate filename with timestamp and new extension
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         filename = f"arkham_draft_{timestamp}.draftmancer.txt"
         
         # Generate file content but don't save locally
@@ -1698,7 +1967,7 @@ def draft():
         investigators_count = len(investigators_cards)
         basic_weaknesses_count = len(basic_weaknesses_cards)
         player_cards_count = len(player_cards)
-        print(f"Generated Draftmancer file: {filename} with {investigator_count} custom cards, {investigators_count} investigators, {basic_weaknesses_count} basic weaknesses, and {player_cards_count} player cards")
+        LOG.info("Generated Draftmancer file: %s with %s custom cards, %s investigators, %s basic weaknesses, and %s player cards", filename, investigator_count, investigators_count, basic_weaknesses_count, player_cards_count)
         
         return render_template('draft_result.html', 
                              selected_sets=selected_sets,
@@ -1710,14 +1979,12 @@ def draft():
                              file_content=file_content)
     
     except Exception as e:
-        print(f"Error generating Draftmancer file: {e}")
+        LOG.error("Error generating Draftmancer file: %s", e)
         return render_template('draft_result.html', selected_sets=selected_sets, 
                              error=f"Error generating draft: {str(e)}")
 
 @app.route('/draft-now', methods=['POST'])
 def draft_now():
-    from flask import jsonify
-    
     arkham_cards = get_arkham_cards()
     selected_sets = request.form.getlist('sets')
     
@@ -1725,10 +1992,11 @@ def draft_now():
     taboo_list_id = request.form.get('tabooList', '').strip()
     taboo_modifications = get_taboo_modifications(taboo_list_id)
     
-    if taboo_modifications:
+    # Only count the forbidden cards when the message will actually be logged
+    if taboo_modifications and LOG.isEnabledFor(logging.INFO):
         forbidden_count = len([code for code, mods in taboo_modifications.items() 
                               if any('Forbidden' in mod.get('text', '') for mod in mods)])
-        print(f"Applying taboo list {taboo_list_id}: excluding {forbidden_count} forbidden cards")
+        LOG.info("Applying taboo list %s: excluding %s forbidden cards", taboo_list_id, forbidden_count)
     
     # Check for cards to include first
     cards_to_include_text = request.form.get('cardsToInclude', '').strip()
@@ -1737,11 +2005,7 @@ def draft_now():
         return jsonify({"error": "No sets selected and no cards to include specified"}), 400
 
     # Process pack quantities - get quantities for each selected pack
-    pack_quantities = {}
-    for pack_name in selected_sets:
-        quantity_key = f'quantity_{pack_name}'
-        quantity = int(request.form.get(quantity_key, 1))  # Default to 1 if not specified
-        pack_quantities[pack_name] = quantity
+    pack_quantities = parse_pack_quantities(request.form, selected_sets)
     
     # Parse excluded cards
     excluded_cards_text = request.form.get('cardsToExclude', '').strip()
@@ -1749,11 +2013,11 @@ def draft_now():
     
     # Parse cards to include (moved earlier for validation)
     try:
-        cards_to_include = parse_cards_to_include(cards_to_include_text)
-        if cards_to_include:
-            print(f"Including {len(cards_to_include)} custom cards for immediate draft: {list(cards_to_include.keys())}")
+        cards_to_include = parse_cards_to_include(cards_to_include_text, arkham_cards)
+        if cards_to_include and LOG.isEnabledFor(logging.INFO):
+            LOG.info("Including %s custom cards for immediate draft: %s", len(cards_to_include), list(cards_to_include.keys()))
     except Exception as e:
-        print(f"Error parsing cards to include: {e}")
+        LOG.error("Error parsing cards to include: %s", e)
         cards_to_include = {}
     
     # Parse layout options
@@ -1764,14 +2028,13 @@ def draft_now():
     unique_cards_only = request.form.get('uniqueCardsOnly') == 'on'
     
     if unique_cards_only:
-        print("Unique cards only setting enabled for immediate draft - limiting each card to appear at most once")
+        LOG.info("Unique cards only setting enabled for immediate draft - limiting each card to appear at most once")
     
     # Get all cards and convert to Draftmancer format
-    print(f"Generating Draftmancer format for immediate draft with {len(selected_sets)} selected sets and quantities: {pack_quantities}")
-    print(f"Layout: {investigators_per_pack} investigators, {basic_weaknesses_per_pack} weaknesses, {player_cards_per_pack} player cards per pack, {player_card_packs_per_player} player card packs per player")
-    if excluded_cards:
-        print(f"Excluding {len(excluded_cards)} cards: {list(excluded_cards)}")
-    arkham_cards = get_arkham_cards()
+    LOG.info("Generating Draftmancer format for immediate draft with %s selected sets and quantities: %s", len(selected_sets), pack_quantities)
+    LOG.info("Layout: %s investigators, %s weaknesses, %s player cards per pack, %s player card packs per player", investigators_per_pack, basic_weaknesses_per_pack, player_cards_per_pack, player_card_packs_per_player)
+    if excluded_cards and LOG.isEnabledFor(logging.INFO):
+        LOG.info("Excluding %s cards: %s", len(excluded_cards), list(excluded_cards))
 
     if not arkham_cards:
         return jsonify({"error": "Unable to load card data"}), 500
@@ -1782,9 +2045,10 @@ def draft_now():
         return jsonify({"error": draftmancer_data["error"]}), 500
 
     # Generate cards for all three sheets with actual quantities and pack multipliers
-    investigators_cards = generate_investigators_cards(draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only)
-    basic_weaknesses_cards = generate_basic_weaknesses_cards(draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only)
-    player_cards = generate_player_cards(draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only)
+    investigators_cards, basic_weaknesses_cards, player_cards = generate_pack_card_sections(
+        draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only,
+        arkham_cards=arkham_cards
+    )
     
     # Add cards to include to appropriate lists and get custom cards
     try:
@@ -1792,7 +2056,7 @@ def draft_now():
             cards_to_include, investigators_cards, basic_weaknesses_cards, player_cards, arkham_cards, draftmancer_data["cards"]
         )
     except Exception as e:
-        print(f"Error adding cards to include for immediate draft: {e}")
+        LOG.error("Error adding cards to include for immediate draft: %s", e)
         custom_cards = []
     
     # Add custom cards to draftmancer data
@@ -1827,9 +2091,9 @@ def draft_now():
         except (ValueError, IndexError):
             continue  # Skip malformed entries
     
-    print(f"Generated Draftmancer content for immediate draft with {draftmancer_data['count']} custom cards, {investigators_count} investigators, {basic_weaknesses_count} basic weaknesses, and {player_cards_total_quantity} total player cards ({len(player_cards)} unique)")
+    LOG.info("Generated Draftmancer content for immediate draft with %s custom cards, %s investigators, %s basic weaknesses, and %s total player cards (%s unique)", draftmancer_data['count'], investigators_count, basic_weaknesses_count, player_cards_total_quantity, len(player_cards))
     
-    return jsonify({
+    return orjson_response({
         "cubeFile": file_content,
         "metadata": {
             "cardCount": draftmancer_data['count'],
@@ -1843,18 +2107,17 @@ def draft_now():
 @app.route('/get-draft-content', methods=['POST'])
 def get_draft_content():
     """Return draft file content for client-side download."""
-    from flask import jsonify
-    
     selected_sets = request.form.getlist('sets')
     
     # Get selected taboo list
     taboo_list_id = request.form.get('tabooList', '').strip()
     taboo_modifications = get_taboo_modifications(taboo_list_id)
     
-    if taboo_modifications:
+    # Only count the forbidden cards when the message will actually be logged
+    if taboo_modifications and LOG.isEnabledFor(logging.INFO):
         forbidden_count = len([code for code, mods in taboo_modifications.items() 
                               if any('Forbidden' in mod.get('text', '') for mod in mods)])
-        print(f"Applying taboo list {taboo_list_id}: excluding {forbidden_count} forbidden cards")
+        LOG.info("Applying taboo list %s: excluding %s forbidden cards", taboo_list_id, forbidden_count)
     
     # Check for cards to include first
     cards_to_include_text = request.form.get('cardsToInclude', '').strip()
@@ -1863,22 +2126,20 @@ def get_draft_content():
         return jsonify({"error": "No sets selected and no cards to include specified"}), 400
     
     # Process pack quantities
-    pack_quantities = {}
-    if selected_sets:
-        for pack_name in selected_sets:
-            quantity_key = f'quantity_{pack_name}'
-            quantity = int(request.form.get(quantity_key, 1))
-            pack_quantities[pack_name] = quantity
+    pack_quantities = parse_pack_quantities(request.form, selected_sets)
     
     # Parse excluded cards
     excluded_cards_text = request.form.get('cardsToExclude', '').strip()
     excluded_cards = parse_excluded_cards(excluded_cards_text)
     
+    # Load the cards once for the whole request
+    arkham_cards = get_arkham_cards()
+    
     # Parse cards to include
     try:
-        cards_to_include = parse_cards_to_include(cards_to_include_text)
+        cards_to_include = parse_cards_to_include(cards_to_include_text, arkham_cards)
     except Exception as e:
-        print(f"Error parsing cards to include: {e}")
+        LOG.error("Error parsing cards to include: %s", e)
         cards_to_include = {}
     
     # Parse layout options
@@ -1888,11 +2149,9 @@ def get_draft_content():
     unique_cards_only = request.form.get('uniqueCardsOnly') == 'on'
     
     if unique_cards_only:
-        print("Unique cards only setting enabled for draft content - limiting each card to appear at most once")
+        LOG.info("Unique cards only setting enabled for draft content - limiting each card to appear at most once")
     
     try:
-        arkham_cards = get_arkham_cards()
-        
         if not arkham_cards:
             return jsonify({"error": "Unable to load card data"}), 500
         
@@ -1907,14 +2166,14 @@ def get_draft_content():
                 "cards": [],
                 "count": 0,
                 "selected_packs": [],
-                "selected_pack_codes": set(),
-                "filtered_cards": []
+                "selected_pack_codes": set()
             }
         
         # Generate cards for all three sheets
-        investigators_cards = generate_investigators_cards(draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only)
-        basic_weaknesses_cards = generate_basic_weaknesses_cards(draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only)
-        player_cards = generate_player_cards(draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only)
+        investigators_cards, basic_weaknesses_cards, player_cards = generate_pack_card_sections(
+            draftmancer_data["selected_pack_codes"], pack_quantities, excluded_cards, taboo_modifications, unique_cards_only,
+            arkham_cards=arkham_cards
+        )
         
         # Add cards to include to appropriate lists and get custom cards
         try:
@@ -1922,7 +2181,7 @@ def get_draft_content():
                 cards_to_include, investigators_cards, basic_weaknesses_cards, player_cards, arkham_cards, draftmancer_data["cards"]
             )
         except Exception as e:
-            print(f"Error adding cards to include: {e}")
+            LOG.error("Error adding cards to include: %s", e)
             custom_cards = []
         
         # Add custom cards to draftmancer data
@@ -1944,24 +2203,46 @@ def get_draft_content():
             player_card_packs_per_player
         )
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         filename = f"arkham_draft_{timestamp}.draftmancer.txt"
         
-        return jsonify({
+        return orjson_response({
             "success": True,
             "filename": filename,
             "content": file_content
         })
         
     except Exception as e:
-        print(f"Error generating draft content: {e}")
+        LOG.error("Error generating draft content: %s", e)
         return jsonify({"error": f"Error generating draft: {str(e)}"}), 500
 
 @app.route('/favicon.ico')
 def favicon():
     """Serve the favicon."""
-    from flask import send_from_directory
     return send_from_directory('static', 'favicon.ico', mimetype='image/vnd.microsoft.icon')
 
+def warm_caches():
+    """Load (and if needed fetch) the ArkhamDB caches so the first request doesn't block on them."""
+    # The endpoints are independent, so fetch them side by side instead of one after another
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(get_packs), executor.submit(get_arkham_cards), executor.submit(get_arkham_taboos)]
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                LOG.error("Cache warmup failed: %s", e)
+
+def start_cache_warmup():
+    """Warm the caches in a background thread; requests arriving meanwhile use the
+    existing (possibly stale) cache files through the normal cache-or-fetch path."""
+    threading.Thread(target=warm_caches, daemon=True).start()
+
+# Importing the module has no side effects; WSGI servers that import it can opt in to the warmup
+if __name__ != '__main__' and os.environ.get('WARM_CACHES') == '1':
+    start_cache_warmup()
+
 if __name__ == '__main__':
+    # The debug reloader runs this block in a watcher process too, only warm in the serving one
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_cache_warmup()
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,120 @@
+import gzip
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import orjson
+
+import app
+
+CARDS = [{'code': '01001', 'name': 'Roland Banks', 'pack_code': 'core'}]
+
+class CorruptCardsCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        app._parsed_caches.clear()
+    
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        self.temp_dir.cleanup()
+        app._parsed_caches.clear()
+    
+    def assert_refetched(self, cache_bytes):
+        with open(app.CARDS_CACHE_FILE, 'wb') as f:
+            f.write(cache_bytes)
+        self.assertEqual(app.load_cached_cards(), (None, False))
+        
+        raw_json = orjson.dumps(CARDS)
+        with mock.patch.object(app, 'download_json', return_value=(raw_json, orjson.loads(raw_json), {})) as download:
+            self.assertEqual(app.get_arkham_cards(), CARDS)
+        download.assert_called_once()
+        with open(app.CARDS_CACHE_FILE, 'rb') as f:
+            self.assertEqual(orjson.loads(gzip.decompress(f.read())), CARDS)
+    
+    def test_not_gzip(self):
+        self.assert_refetched(b'garbage, not gzip data')
+    
+    def test_truncated_gzip(self):
+        self.assert_refetched(gzip.compress(orjson.dumps(CARDS))[:20])
+    
+    def test_corrupted_gzip(self):
+        data = bytearray(gzip.compress(orjson.dumps(CARDS)))
+        data[12:20] = b'\xff' * 8
+        self.assert_refetched(bytes(data))
+
+def fake_get(url, timeout=None, headers=None):
+    """Stand-in for SESSION.get serving CARDS with ETag "v1", honoring If-None-Match."""
+    response = mock.Mock(headers={'ETag': '"v1"'})
+    if headers and headers.get('If-None-Match') == '"v1"':
+        response.status_code = 304
+    else:
+        response.status_code = 200
+        response.content = orjson.dumps(CARDS)
+    return response
+
+class CorruptCardsCacheConditionalTest(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        app._parsed_caches.clear()
+    
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        self.temp_dir.cleanup()
+        app._parsed_caches.clear()
+    
+    def test_unchanged_corrupt_cache_is_refetched(self):
+        app.write_cache_bytes(app.CARDS_CACHE_FILE, orjson.dumps(CARDS), {'etag': '"v1"'})
+        with open(app.CARDS_CACHE_FILE, 'wb') as f:
+            f.write(b'garbage')
+        
+        with mock.patch.object(app.SESSION, 'get', side_effect=fake_get) as get:
+            self.assertEqual(app.get_arkham_cards(), CARDS)
+        # The conditional request got a 304, so the cache was refetched unconditionally
+        self.assertEqual(get.call_count, 2)
+        self.assertFalse(get.call_args.kwargs['headers'])
+        self.assertEqual(app.load_cached_cards()[0], CARDS)
+    
+    def test_unchanged_cache_is_renewed(self):
+        app.write_cache_bytes(app.CARDS_CACHE_FILE, orjson.dumps(CARDS), {'etag': '"v1"'})
+        os.utime(app.CARDS_CACHE_FILE, (0, 0))
+        
+        with mock.patch.object(app.SESSION, 'get', side_effect=fake_get) as get:
+            self.assertEqual(app.fetch_and_cache_cards(), CARDS)
+        get.assert_called_once()
+        self.assertTrue(app.load_cached_cards()[1])
+
+class IndexEtagTest(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        app._parsed_caches.clear()
+        for cache_file in (app.PACKS_CACHE_FILE, app.CARDS_CACHE_FILE, app.TABOO_CACHE_FILE):
+            app.write_cache_bytes(cache_file, b'[]', {'etag': f'"{cache_file}-v1"'})
+            # Backdate the caches so renewing them visibly changes their mtimes
+            os.utime(cache_file, (0, 0))
+    
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        self.temp_dir.cleanup()
+        app._parsed_caches.clear()
+    
+    def test_renewed_caches_keep_etag(self):
+        etag = app.get_index_etag()
+        self.assertIsNotNone(etag)
+        for cache_file in (app.PACKS_CACHE_FILE, app.CARDS_CACHE_FILE, app.TABOO_CACHE_FILE):
+            app.renew_cache_file(cache_file)
+        self.assertEqual(app.get_index_etag(), etag)
+    
+    def test_rewritten_cache_changes_etag(self):
+        etag = app.get_index_etag()
+        app.write_cache_bytes(app.CARDS_CACHE_FILE, b'[]', {'etag': '"cards-v2"'})
+        self.assertNotEqual(app.get_index_etag(), etag)
+
+if __name__ == '__main__':
+    unittest.main()